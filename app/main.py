@@ -490,6 +490,24 @@ def translate_bilingual():
     )
 
 
+def _find_task_file(task_dir, prefix, suffix, exclude_prefix=None):
+    """在任务目录中查找首个匹配 prefix*suffix 的文件；找到即返回，不做全量列举"""
+    try:
+        with os.scandir(task_dir) as it:
+            for entry in it:
+                name = entry.name
+                if (
+                    name.startswith(prefix)
+                    and name.endswith(suffix)
+                    and not (exclude_prefix and name.startswith(exclude_prefix))
+                    and entry.is_file()
+                ):
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
 @main_bp.route("/api/result/<task_id>")
 @api_error_handler
 def get_result(task_id):
@@ -505,12 +523,10 @@ def get_result(task_id):
     bilingual_text = ""
     try:
         if getattr(task, "translation_ready", False):
-            task_dir = os.path.join(video_processor.output_dir, task_id)
-            bilingual_files = glob.glob(
-                os.path.join(task_dir, "transcript_bilingual_*.md")
-            )
-            if bilingual_files:
-                with open(bilingual_files[0], "r", encoding="utf-8") as f:
+            task_dir = video_processor.task_dir(task_id)
+            bilingual_path = _find_task_file(task_dir, "transcript_bilingual_", ".md")
+            if bilingual_path:
+                with open(bilingual_path, "r", encoding="utf-8") as f:
                     bilingual_text = f.read()
     except Exception:
         pass
@@ -549,35 +565,29 @@ def download_file(task_id, file_type):
         ):
             return jsonify({"success": False, "message": "不支持的文件类型"}), 200
 
-        task_dir = os.path.join(video_processor.output_dir, task_id)
+        task_dir = video_processor.task_dir(task_id)
         if not os.path.exists(task_dir):
             return jsonify({"success": False, "message": "任务目录不存在"}), 200
 
         # transcript：优先原始逐字稿，兼容旧数据时回退 bilingual
         if file_type == "transcript":
-            transcript_files = [
-                path
-                for path in glob.glob(os.path.join(task_dir, "transcript_*.md"))
-                if "transcript_bilingual_" not in os.path.basename(path)
-            ]
-            if transcript_files:
-                return send_file(transcript_files[0], as_attachment=True)
+            transcript_path = _find_task_file(
+                task_dir, "transcript_", ".md", exclude_prefix="transcript_bilingual_"
+            )
+            if transcript_path:
+                return send_file(transcript_path, as_attachment=True)
             transcript_fallback = os.path.join(task_dir, "transcript.md")
             if os.path.exists(transcript_fallback):
                 return send_file(transcript_fallback, as_attachment=True)
-            bilingual_files = glob.glob(
-                os.path.join(task_dir, "transcript_bilingual_*.md")
-            )
-            if bilingual_files:
-                return send_file(bilingual_files[0], as_attachment=True)
+            bilingual_path = _find_task_file(task_dir, "transcript_bilingual_", ".md")
+            if bilingual_path:
+                return send_file(bilingual_path, as_attachment=True)
             return jsonify({"success": False, "message": "未找到逐字稿文件"}), 200
 
         if file_type == "transcript_bilingual":
-            bilingual_files = glob.glob(
-                os.path.join(task_dir, "transcript_bilingual_*.md")
-            )
-            if bilingual_files:
-                return send_file(bilingual_files[0], as_attachment=True)
+            bilingual_path = _find_task_file(task_dir, "transcript_bilingual_", ".md")
+            if bilingual_path:
+                return send_file(bilingual_path, as_attachment=True)
             return jsonify({"success": False, "message": "未找到中英对照文件"}), 200
 
         # summary/analysis/data
@@ -729,7 +739,7 @@ def download_video_file(task_id: str):
     # Enforce file stays within output/<task_id>/
     from app.utils.path_safety import safe_join
 
-    task_dir = os.path.join(video_processor.output_dir, task_id)
+    task_dir = video_processor.task_dir(task_id)
     try:
         # Use basename to avoid client-controlled subpaths
         candidate = safe_join(task_dir, os.path.basename(file_path))
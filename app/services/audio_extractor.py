@@ -1,15 +1,24 @@
 import ffmpeg
 import os
 import re
+import struct
 from typing import Optional
 from app.config.settings import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# WAV 文件结构：RIFF/WAVE 文件头，随后是若干 (id, size) 块；fmt 的前 16 字节为 PCM 参数
+_RIFF_HEADER = struct.Struct("<4sI4s")
+_CHUNK_HEADER = struct.Struct("<4sI")
+_FMT_PCM = struct.Struct("<HHIIHH")
+# 最多遍历的块数，防止畸形文件导致长时间扫描
+_WAV_MAX_CHUNKS = 64
+
 class AudioExtractor:
-    def __init__(self):
-        self.config = Config.load_config()
+    def __init__(self, config=None):
+        # config 可由上层（VideoProcessor）传入，避免重复解析 config.yaml
+        self.config = config if config is not None else Config.load_config()
         # 使用项目根锚定的绝对路径，避免 CWD 引起的漂移
         self.temp_dir = Config.resolve_path(self.config['system']['temp_dir'])
         self.output_dir = Config.resolve_path(self.config['system']['output_dir'])
@@ -150,60 +159,133 @@ class AudioExtractor:
         safe_base_name = self._sanitize_filename(base_name)
         logger.debug(f"清理后基础文件名: {safe_base_name}")
         
+        # 一次 ffmpeg 调用（segment 复用器）写出全部分段，避免每段启动一次进程
+        # 模式串按 printf 解析：整个路径前缀（含 temp_dir）中的 % 都需转义
+        segment_prefix = os.path.join(self.temp_dir, safe_base_name).replace('%', '%%')
+        segment_pattern = f"{segment_prefix}_segment_%03d.{self.audio_format}"
+
         try:
+            logger.debug(f"开始分段: pattern={segment_pattern}")
+            try:
+                (
+                    ffmpeg
+                    .input(input_path)
+                    .output(
+                        segment_pattern,
+                        f='segment',
+                        segment_time=segment_duration,
+                        reset_timestamps=1,
+                        acodec='pcm_s16le',
+                        ar=self.sample_rate,
+                        ac=1,
+                    )
+                    .run(quiet=True, overwrite_output=True)
+                )
+            except Exception as segment_error:
+                logger.error(f"ffmpeg 分段失败: {segment_error}")
+                logger.error(f"错误类型: {type(segment_error)}")
+                raise Exception(f"创建分段失败: {segment_error}")
+
             current_time = 0
             segment_index = 0
-            
+
             while current_time < duration:
                 end_time = min(current_time + segment_duration, duration)
                 segment_filename = f"{safe_base_name}_segment_{segment_index:03d}.{self.audio_format}"
                 segment_path = os.path.join(self.temp_dir, segment_filename)
-                
-                logger.debug(f"创建分段 {segment_index}: {segment_path}")
+
+                logger.debug(f"分段 {segment_index}: {segment_path}")
                 logger.debug(f"时间范围: {current_time:.2f}s - {end_time:.2f}s")
-                
-                try:
-                    (
-                        ffmpeg
-                        .input(input_path, ss=current_time, t=end_time - current_time)
-                        .output(segment_path, acodec='pcm_s16le', ar=self.sample_rate, ac=1)
-                        .run(quiet=True, overwrite_output=True)
-                    )
-                    logger.debug(f"分段 {segment_index} 创建成功")
-                    
-                    # 验证文件是否真的创建了
-                    if os.path.exists(segment_path):
-                        file_size = os.path.getsize(segment_path)
-                        logger.debug(f"分段文件大小: {file_size} bytes")
-                    else:
-                        logger.error(f"分段文件不存在: {segment_path}")
-                        raise Exception(f"分段文件创建失败: {segment_path}")
-                        
-                except Exception as segment_error:
-                    logger.error(f"创建分段 {segment_index} 失败: {segment_error}")
-                    logger.error(f"错误类型: {type(segment_error)}")
-                    raise Exception(f"创建分段失败: {segment_error}")
-                
+
+                # 验证文件是否真的创建了
+                if os.path.exists(segment_path):
+                    file_size = os.path.getsize(segment_path)
+                    logger.debug(f"分段文件大小: {file_size} bytes")
+                elif end_time >= duration and segment_index > 0:
+                    # 探测时长与实际采样略有出入时，ffmpeg 可能不会写出极短的尾段，
+                    # 该尾部已包含在上一分段中
+                    logger.warning(f"尾部分段未生成，已并入上一分段: {segment_path}")
+                    segments[-1]['end_time'] = duration
+                    break
+                else:
+                    logger.error(f"分段文件不存在: {segment_path}")
+                    raise Exception(f"分段文件创建失败: {segment_path}")
+
                 segments.append({
                     'path': segment_path,
                     'start_time': current_time,
                     'end_time': end_time,
                     'index': segment_index
                 })
-                
+
                 current_time = end_time
                 segment_index += 1
-            
+
             logger.debug(f"音频分割完成，共创建 {len(segments)} 个分段")
             return segments
-            
+
         except Exception as e:
             logger.error(f"音频分割过程失败: {e}")
             logger.error(f"错误类型: {type(e)}")
             raise Exception(f"音频分割失败: {e}")
-    
+
+    def _read_wav_header_info(self, audio_path: str) -> Optional[dict]:
+        """遍历 RIFF 块读取 PCM WAV 的 fmt/data 信息；非 PCM WAV 返回 None。
+
+        ffmpeg 默认会在 data 前写入 LIST/INFO 等块，因此不能假定 44 字节标准头。
+        """
+        try:
+            size = os.path.getsize(audio_path)
+            with open(audio_path, 'rb') as f:
+                header = f.read(_RIFF_HEADER.size)
+                if len(header) < _RIFF_HEADER.size:
+                    return None
+                riff, _, wave_id = _RIFF_HEADER.unpack(header)
+                if riff != b'RIFF' or wave_id != b'WAVE':
+                    return None
+
+                fmt = None
+                for _ in range(_WAV_MAX_CHUNKS):
+                    chunk = f.read(_CHUNK_HEADER.size)
+                    if len(chunk) < _CHUNK_HEADER.size:
+                        return None
+                    chunk_id, chunk_size = _CHUNK_HEADER.unpack(chunk)
+                    if chunk_id == b'data':
+                        if fmt is None:
+                            return None
+                        audio_fmt, channels, sample_rate, byte_rate, _, bits = fmt
+                        if audio_fmt != 1 or not byte_rate:
+                            return None
+                        # 流式写出的 data 大小可能是占位值，以实际剩余字节为上限
+                        data_size = min(chunk_size, size - f.tell())
+                        return {
+                            'duration': data_size / byte_rate,
+                            'sample_rate': sample_rate,
+                            'channels': channels,
+                            'codec': f'pcm_s{bits}le' if bits > 8 else 'pcm_u8',
+                            'bitrate': byte_rate * 8,
+                            'size': size,
+                        }
+                    if chunk_id == b'fmt ':
+                        if chunk_size < _FMT_PCM.size:
+                            return None
+                        fmt = _FMT_PCM.unpack(f.read(_FMT_PCM.size))
+                        remaining = chunk_size - _FMT_PCM.size
+                    else:
+                        # LIST/fact 等其它块直接跳过
+                        remaining = chunk_size
+                    # 块数据按偶数字节对齐
+                    f.seek(remaining + (chunk_size & 1), os.SEEK_CUR)
+            return None
+        except (OSError, struct.error):
+            return None
+
     def get_audio_info(self, audio_path: str) -> dict:
         """获取音频文件信息"""
+        # 标准 PCM WAV 只需读取文件头，无需启动 ffprobe
+        info = self._read_wav_header_info(audio_path)
+        if info is not None:
+            return info
         try:
             probe = ffmpeg.probe(audio_path)
             audio_stream = next((stream for stream in probe.get('streams', []) 
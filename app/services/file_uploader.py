@@ -16,8 +16,9 @@ logger = logging.getLogger(__name__)
 class FileUploader:
     """文件上传服务 - 处理本地视频和音频文件上传"""
     
-    def __init__(self):
-        self.config = Config.load_config()
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        # config 可由上层（VideoProcessor）传入，避免重复解析 config.yaml
+        self.config = config if config is not None else Config.load_config()
         self.file_manager = FileManager()
         
         # 获取上传配置（优先环境变量，其次配置文件），默认500MB
@@ -33,6 +34,9 @@ class FileUploader:
                                                                    ['mp4', 'avi', 'mov', 'mkv', 'webm', 'flv'])
         self.allowed_audio_formats = self.config.get('upload', {}).get('allowed_audio_formats', 
                                                                    ['mp3', 'wav', 'aac', 'm4a', 'ogg'])
+        # 扩展名 -> (文件类型, 是否需要提取音频)，O(1) 查表代替逐个列表扫描；视频格式优先
+        self._ext_types = {ext: ('audio', False) for ext in self.allowed_audio_formats}
+        self._ext_types.update({ext: ('video', True) for ext in self.allowed_video_formats})
         self.upload_chunk_size = self.config.get('upload', {}).get('upload_chunk_size', 5) * 1024 * 1024  # MB to bytes
         
         # 临时存储目录（锚定项目根）
@@ -85,14 +89,10 @@ class FileUploader:
         # 确定文件类型
         file_ext = os.path.splitext(filename)[1].lower().lstrip('.')
         
-        if file_ext in self.allowed_video_formats:
-            file_type = "video"
-            need_audio_extraction = True
-        elif file_ext in self.allowed_audio_formats:
-            file_type = "audio"
-            need_audio_extraction = False
-        else:
+        ext_type = self._ext_types.get(file_ext)
+        if ext_type is None:
             raise ValueError(f"不支持的文件格式: {file_ext}")
+        file_type, need_audio_extraction = ext_type
         
         # 获取MIME类型
         mime_type, _ = mimetypes.guess_type(filename)
@@ -122,8 +122,7 @@ class FileUploader:
         
         # 检查文件扩展名
         file_ext = os.path.splitext(filename)[1].lower().lstrip('.')
-        if (file_ext not in self.allowed_video_formats and 
-            file_ext not in self.allowed_audio_formats):
+        if file_ext not in self._ext_types:
             return False, f"不支持的文件格式: {file_ext}"
         
         # 检查MIME类型
@@ -28,6 +28,10 @@ import time
 # Global: limit concurrent downloads to protect CPU/network.
 _DOWNLOAD_SEMAPHORE = threading.BoundedSemaphore(2)
 
+# Resolved ffmpeg binary per PATH value. Only hits are cached, so installing
+# ffmpeg while the app is running is still picked up on the next download.
+_FFMPEG_PATH_CACHE: Dict[str, str] = {}
+
 from app.services.file_manager import FileManager
 
 
@@ -117,8 +121,9 @@ def _build_timestamp_suffix(dt: Optional[datetime] = None) -> str:
 class VideoDownloader:
     """Lightweight downloader based on yt_dlp."""
 
-    def __init__(self):
-        cfg = Config.load_config()
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        # config may be handed down by VideoProcessor to avoid re-parsing config.yaml
+        cfg = config if config is not None else Config.load_config()
         self.config = cfg
         self.temp_dir = Config.resolve_path(
             (cfg.get("system") or {}).get("temp_dir", "temp")
@@ -131,6 +136,19 @@ class VideoDownloader:
         return utils_sanitize_filename(filename, default_name="file", max_length=100)
 
     def _get_ffmpeg_path(self) -> Optional[str]:
+        path_env = os.environ.get("PATH", "")
+        cached = _FFMPEG_PATH_CACHE.get(path_env)
+        if cached:
+            return cached
+        ffmpeg_path = self._probe_ffmpeg_path()
+        if ffmpeg_path:
+            _FFMPEG_PATH_CACHE[path_env] = ffmpeg_path
+            return ffmpeg_path
+        logger.warning("FFmpeg not found; ensure it is installed and on PATH")
+        return None
+
+    @staticmethod
+    def _probe_ffmpeg_path() -> Optional[str]:
         ffmpeg_path = shutil.which("ffmpeg")
         if ffmpeg_path:
             return ffmpeg_path
@@ -152,7 +170,6 @@ class VideoDownloader:
             ):
                 if os.path.exists(path):
                     return path
-        logger.warning("FFmpeg not found; ensure it is installed and on PATH")
         return None
 
     def _build_base_opts(
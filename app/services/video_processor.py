@@ -4,10 +4,18 @@ import json
 import uuid
 import glob
 import re
+import sys
 import time
 import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union, cast
+from typing import Optional, Dict, Any, List, Set, Union, cast
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选加速依赖，缺失时回退到标准库 json
+    orjson = None
+
 from app.models.data_models import (
     ProcessingTask,
     VideoInfo,
@@ -26,6 +34,26 @@ from app.utils.helpers import sanitize_filename as utils_sanitize_filename
 from app.utils.webhook_notifier import send_task_completed_webhooks
 
 
+_TASK_NOT_FOUND_PROGRESS = {"error": "任务不存在"}
+
+
+def _intern_status(value: Any) -> Any:
+    """状态字符串驻留：与代码中的字面量同一对象，比较走指针相等快路径。
+
+    从 JSON 加载的字符串是新对象，不驻留时每次 == 都要逐字符比较。
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _is_live_task(task: Any) -> bool:
+    """任务是否仍在使用：待处理/处理中、翻译中或上传未完成。"""
+    return (
+        getattr(task, "status", None) in ("pending", "processing")
+        or getattr(task, "translation_status", None) == "processing"
+        or getattr(task, "upload_status", None) in ("pending", "uploading")
+    )
+
+
 class _TaskStore:
     """管理 VideoProcessor 的任务存储和取消标记逻辑（内部使用）。"""
 
@@ -34,20 +62,50 @@ class _TaskStore:
 
     def request_cancel(self, task_id: str) -> None:
         with self._owner._lock:
-            self._owner._cancel_flags[task_id] = True
+            self._owner._cancelled_ids.add(task_id)
 
     def cancel_all_processing(self) -> List[str]:
-        affected: List[str] = []
         with self._owner._lock:
-            for tid, t in self._owner.tasks.items():
-                if getattr(t, "status", None) == "processing":
-                    self._owner._cancel_flags[tid] = True
-                    affected.append(tid)
+            affected = [
+                tid
+                for tid, t in self._owner.tasks.items()
+                if getattr(t, "status", None) == "processing"
+            ]
+            self._owner._cancelled_ids.update(affected)
         return affected
 
+    def evict_excess(self, keep: Optional[str] = None) -> int:
+        """任务数超过 max_tasks 时按插入顺序淘汰最旧的已结束任务（调用方持锁）。
+
+        keep 为刚插入的任务ID，始终保留；仍可能被使用的任务（见 _is_live_task）
+        也不会被淘汰，因此任务数可能暂时超过上限。只移除内存记录，不删除产物文件。
+        """
+        owner = self._owner
+        limit = owner.max_tasks
+        excess = len(owner.tasks) - limit
+        if limit <= 0 or excess <= 0:
+            return 0
+        victims: List[str] = []
+        for tid, t in owner.tasks.items():
+            if tid == keep or _is_live_task(t):
+                continue
+            victims.append(tid)
+            if len(victims) >= excess:
+                break
+        for tid in victims:
+            del owner.tasks[tid]
+            owner._cancelled_ids.discard(tid)
+        if victims:
+            owner.logger.info(
+                f"历史任务超过上限 {limit}，已淘汰 {len(victims)} 个任务记录"
+                f"（产物目录保留在磁盘上，不会自动清理）: {', '.join(victims)}"
+            )
+        return len(victims)
+
     def is_cancelled(self, task_id: str) -> bool:
-        with self._owner._lock:
-            return self._owner._cancel_flags.get(task_id, False)
+        # 单次集合成员判断本身是原子的，热路径（下载/转录循环）无需加锁；
+        # 移除只发生在淘汰已结束的任务时，不会与进行中任务的检查竞争
+        return task_id in self._owner._cancelled_ids
 
     def create_task(
         self,
@@ -132,12 +190,12 @@ class VideoProcessor:
             self.temp_dir = temp_dir
         os.makedirs(self.temp_dir, exist_ok=True)
 
-        # 初始化服务
-        self.video_downloader = VideoDownloader()
-        self.audio_extractor = AudioExtractor()
+        # 初始化服务（复用已加载的配置，避免每个子服务各自重新解析 config.yaml）
+        self.video_downloader = VideoDownloader(self.config)
+        self.audio_extractor = AudioExtractor(self.config)
         self.speech_to_text = SpeechToText()
         self.text_processor = TextProcessor()
-        self.file_uploader = FileUploader()
+        self.file_uploader = FileUploader(self.config)
 
         # 处理参数（可配置，提供默认值保持兼容）
         proc_cfg = self.config.get("processing") or {}
@@ -149,12 +207,14 @@ class VideoProcessor:
         self.short_audio_max_retries = int(proc_cfg.get("short_audio_max_retries", 3))
         self.retry_sleep_short = float(proc_cfg.get("retry_sleep_short_seconds", 1.0))
         self.retry_sleep_long = float(proc_cfg.get("retry_sleep_long_seconds", 2.0))
+        # 内存/tasks.json 中保留的历史任务上限（默认 0 表示不限制）
+        self.max_tasks = int(proc_cfg.get("max_tasks", 0))
 
-        # 存储处理任务
-        self.tasks: Dict[str, Union[ProcessingTask, UploadTask]] = {}
+        # 存储处理任务（按创建顺序，超出上限时从最旧端淘汰）
+        self.tasks: "OrderedDict[str, Union[ProcessingTask, UploadTask]]" = OrderedDict()
         self.tasks_file = os.path.join(self.output_dir, "tasks.json")
-        # 任务取消标记存储
-        self._cancel_flags: Dict[str, bool] = {}
+        # 已请求取消的任务ID（增删均持锁；仅在任务被淘汰时移除，此时已无流水线读取它）
+        self._cancelled_ids: Set[str] = set()
 
         # 内部子组件：任务存储与处理流水线（保持对外 API 不变）
         self._task_store = _TaskStore(self)
@@ -164,6 +224,14 @@ class VideoProcessor:
         self.load_tasks_from_disk()
         self._cleanup_stale_partial_downloads()
 
+    def task_dir(self, task_id: str) -> str:
+        """任务产物目录 output/<task_id>。
+
+        output_dir 已是规范化的绝对路径，直接拼接即可，省去 os.path.join 的逐段处理。
+        task_id 必须是内部生成/已校验的 ID，不能是用户传入的任意路径。
+        """
+        return f"{self.output_dir}{os.sep}{task_id}"
+
     def request_cancel(self, task_id: str):
         """请求取消指定任务"""
         self._task_store.request_cancel(task_id)
@@ -227,7 +295,7 @@ class VideoProcessor:
         return dict(
             id=task_data["id"],
             video_url=task_data.get("video_url", ""),
-            status=task_data.get("status", "failed"),
+            status=_intern_status(task_data.get("status", "failed")),
             created_at=datetime.fromisoformat(task_data["created_at"]),
             audio_file_path=task_data.get("audio_file_path"),
             video_file_path=task_data.get("video_file_path"),
@@ -244,10 +312,49 @@ class VideoProcessor:
             transcript_ready=task_data.get("transcript_ready", False),
             ai_response_times=task_data.get("ai_response_times", {}) or {},
             download_format=task_data.get("download_format"),
-            translation_status=task_data.get("translation_status", ""),
+            translation_status=_intern_status(task_data.get("translation_status", "")),
             translation_ready=task_data.get("translation_ready", False),
         )
 
+    def _task_from_dict(
+        self, task_data: Dict[str, Any]
+    ) -> Union[ProcessingTask, UploadTask]:
+        """由 tasks.json 中的一条记录构建任务对象（子对象先构建，一次传入构造器）。"""
+        vi = task_data.get("video_info")
+        common_kwargs = self._build_common_task_kwargs(task_data)
+        common_kwargs["video_info"] = (
+            VideoInfo(
+                title=vi.get("title", ""),
+                url=vi.get("url", task_data.get("video_url", "")),
+                duration=vi.get("duration", 0),
+                uploader=vi.get("uploader", ""),
+                description=vi.get("description", ""),
+            )
+            if vi
+            else None
+        )
+
+        # 判断任务类型（向后兼容：无type但带上传字段则视为上传任务）
+        is_upload = (task_data.get("type") == "upload") or (
+            "upload_status" in task_data or "original_filename" in task_data
+        )
+        if not is_upload:
+            return ProcessingTask(**common_kwargs)
+
+        upload_time = task_data.get("upload_time")
+        return UploadTask(
+            **common_kwargs,
+            file_type=task_data.get("file_type", "audio"),
+            original_filename=task_data.get("original_filename", ""),
+            file_size=task_data.get("file_size", 0),
+            file_duration=task_data.get("file_duration", 0.0),
+            upload_time=datetime.fromisoformat(upload_time) if upload_time else None,
+            need_audio_extraction=task_data.get("need_audio_extraction", False),
+            upload_progress=task_data.get("upload_progress", 0),
+            upload_status=_intern_status(task_data.get("upload_status", "")),
+            upload_error_message=task_data.get("upload_error_message", ""),
+        )
+
     def create_task(
         self,
         video_url: str,
@@ -269,6 +376,7 @@ class VideoProcessor:
             task.bilibili_cookies = bilibili_cookies
         with self._lock:
             self.tasks[task_id] = task
+            self._task_store.evict_excess(keep=task_id)
             self.save_tasks_to_disk()
         return task_id
 
@@ -289,6 +397,7 @@ class VideoProcessor:
 
         with self._lock:
             self.tasks[task_id] = upload_task
+            self._task_store.evict_excess(keep=task_id)
             self.save_tasks_to_disk()
         return task_id
 
@@ -530,7 +639,7 @@ class VideoProcessor:
                     self._update_progress(task, stage="下载视频", detail=detail)
 
             # Download artifacts should be isolated under output/<task_id>/
-            task_output_dir = os.path.join(self.output_dir, task_id)
+            task_output_dir = self.task_dir(task_id)
             os.makedirs(task_output_dir, exist_ok=True)
 
             cookies_str, cookies_domain = self._resolve_site_cookies(
@@ -1206,7 +1315,7 @@ class VideoProcessor:
     def _save_results(self, task: ProcessingTask):
         """保存处理结果"""
         # 使用任务ID作为目录名，确保路径安全
-        task_dir = os.path.join(self.output_dir, task.id)
+        task_dir = self.task_dir(task.id)
         os.makedirs(task_dir, exist_ok=True)
 
         # 安全的文件名基础（基于清理后的标题或任务ID）
@@ -1406,8 +1515,17 @@ class VideoProcessor:
         """获取任务进度"""
         task = self.get_task(task_id)
         if not task:
-            return {"error": "任务不存在"}
+            return dict(_TASK_NOT_FOUND_PROGRESS)
+
+        # 逐字稿/预览：优先 task.transcript；若无则降级为原始转写文本
+        if task.transcript and task.transcript.strip():
+            full_text = task.transcript
+        elif task.transcription:
+            full_text = (getattr(task.transcription, "full_text", "") or "").strip()
+        else:
+            full_text = ""
 
+        vi = task.video_info
         progress_info = {
             "id": task.id,
             "status": task.status,
@@ -1417,35 +1535,22 @@ class VideoProcessor:
             "estimated_time": task.estimated_time,
             "processed_segments": task.processed_segments,
             "total_segments": task.total_segments,
-            "video_title": task.video_info.title if task.video_info else "",
-            "video_uploader": task.video_info.uploader if task.video_info else "",
-            "video_duration": task.video_info.duration if task.video_info else 0,
+            "video_title": vi.title if vi else "",
+            "video_uploader": vi.uploader if vi else "",
+            "video_duration": vi.duration if vi else 0,
             "error_message": task.error_message,
             "ai_response_times": getattr(task, "ai_response_times", {}),
-            "transcript_ready": getattr(task, "transcript_ready", False),
+            # 有可预览文本时，即便后端未设置也标记为就绪
+            "transcript_ready": bool(full_text)
+            or getattr(task, "transcript_ready", False),
             "translation_status": getattr(task, "translation_status", ""),
             "translation_ready": getattr(task, "translation_ready", False),
         }
-
-        # 返回逐字稿/预览：优先返回 task.transcript；若无则降级为原始转写文本
-        if task.transcript and task.transcript.strip():
+        if full_text:
             progress_info["transcript_preview"] = (
-                task.transcript[:500] + "..."
-                if len(task.transcript) > 500
-                else task.transcript
+                full_text[:500] + "..." if len(full_text) > 500 else full_text
             )
-            progress_info["full_transcript"] = task.transcript
-            progress_info["transcript_ready"] = True
-        elif (
-            task.transcription and getattr(task.transcription, "full_text", "").strip()
-        ):
-            raw_text = task.transcription.full_text.strip()
-            progress_info["transcript_preview"] = (
-                raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
-            )
-            progress_info["full_transcript"] = raw_text
-            # 即便后端未设置，也在进度响应中标记可预览
-            progress_info["transcript_ready"] = True
+            progress_info["full_transcript"] = full_text
 
         return progress_info
 
@@ -1486,17 +1591,28 @@ class VideoProcessor:
             self.save_tasks_to_disk()
 
     def _save_bilingual_transcript(self, task: ProcessingTask, content: str):
-        task_dir = os.path.join(self.output_dir, task.id)
+        task_dir = self.task_dir(task.id)
         os.makedirs(task_dir, exist_ok=True)
         if task.video_info and task.video_info.title:
             safe_base = self._sanitize_filename(task.video_info.title)
         else:
             safe_base = f"video_{task.id[:8]}"
         out_path = os.path.join(task_dir, f"transcript_bilingual_{safe_base}.md")
+        # 只写正文，不写任何标题，避免模型/文件头部混入额外说明
+        payload = (content.strip() + "\n").encode("utf-8")
         try:
-            with open(out_path, "w", encoding="utf-8") as f:
-                # 只写正文，不写任何标题，避免模型/文件头部混入额外说明
-                f.write(content.strip() + "\n")
+            # 一次编码、直接写文件描述符，跳过 TextIOWrapper 的编码/缓冲层
+            fd = os.open(
+                out_path,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+                0o644,
+            )
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
         except Exception as e:
             self.logger.warning(f"保存对照逐字稿失败: {e}")
 
@@ -1504,67 +1620,27 @@ class VideoProcessor:
         """从磁盘加载任务数据"""
         try:
             if os.path.exists(self.tasks_file):
-                with open(self.tasks_file, "r", encoding="utf-8") as f:
-                    tasks_data = json.load(f)
+                with open(self.tasks_file, "rb") as f:
+                    raw = f.read()
+                tasks_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                # 单次遍历：未完成的任务标记为失败（程序重启导致中断），并构建完整任务对象
+                loaded: Dict[str, Union[ProcessingTask, UploadTask]] = {}
+                interrupted = 0
+                for task_data in tasks_data:
+                    if task_data.get("status") == "processing":
+                        task_data["status"] = "failed"
+                        task_data["error_message"] = "程序重启导致任务中断"
+                        task_data["progress"] = 0
+                        interrupted += 1
+                    task = self._task_from_dict(task_data)
+                    loaded[task.id] = task
                 with self._lock:
-                    # 过滤掉未完成的任务（只加载已完成或失败的任务）
-                    completed_tasks = []
-                    for task_data in tasks_data:
-                        # 将未完成的任务标记为失败
-                        if task_data.get("status") == "processing":
-                            task_data["status"] = "failed"
-                            task_data["error_message"] = "程序重启导致任务中断"
-                            task_data["progress"] = 0
-
-                        # 判断任务类型（向后兼容：无type但带上传字段则视为上传任务）
-                        is_upload = (task_data.get("type") == "upload") or (
-                            "upload_status" in task_data
-                            or "original_filename" in task_data
-                        )
-                        common_kwargs = self._build_common_task_kwargs(task_data)
-                        if is_upload:
-                            task = UploadTask(
-                                **common_kwargs,
-                                file_type=task_data.get("file_type", "audio"),
-                                original_filename=task_data.get(
-                                    "original_filename", ""
-                                ),
-                                file_size=task_data.get("file_size", 0),
-                                file_duration=task_data.get("file_duration", 0.0),
-                                upload_time=datetime.fromisoformat(
-                                    task_data["upload_time"]
-                                )
-                                if task_data.get("upload_time")
-                                else None,
-                                need_audio_extraction=task_data.get(
-                                    "need_audio_extraction", False
-                                ),
-                                upload_progress=task_data.get("upload_progress", 0),
-                                upload_status=task_data.get("upload_status", ""),
-                                upload_error_message=task_data.get(
-                                    "upload_error_message", ""
-                                ),
-                            )
-                        else:
-                            task = ProcessingTask(**common_kwargs)
-
-                        # 恢复视频信息
-                        if task_data.get("video_info"):
-                            vi = task_data["video_info"] or {}
-                            task.video_info = VideoInfo(
-                                title=vi.get("title", ""),
-                                url=vi.get("url", task_data.get("video_url", "")),
-                                duration=vi.get("duration", 0),
-                                uploader=vi.get("uploader", ""),
-                                description=vi.get("description", ""),
-                            )
-
-                        self.tasks[task.id] = task
-                        completed_tasks.append(task_data)
+                    self.tasks.update(loaded)
+                    self._task_store.evict_excess()
 
                 # 发现清理则原子覆盖写回
-                if len(completed_tasks) != len(tasks_data):
-                    self._atomic_write_tasks(completed_tasks)
+                if interrupted:
+                    self._atomic_write_tasks(tasks_data)
                     self.logger.info(
                         f"已清理未完成任务，加载 {len(self.tasks)} 个历史任务"
                     )
@@ -1587,11 +1663,25 @@ class VideoProcessor:
         directory = os.path.dirname(self.tasks_file) or "."
         os.makedirs(directory, exist_ok=True)
         tmp_path = self.tasks_file + ".tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(tasks_data, f, ensure_ascii=False, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp_path, self.tasks_file)
+        if orjson is not None:
+            payload = orjson.dumps(
+                tasks_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            payload = json.dumps(tasks_data, ensure_ascii=False, indent=2).encode("utf-8")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.tasks_file)
+        except BaseException:
+            # 写入失败时旧的 tasks.json 保持原样，只需清掉半成品临时文件
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
 
     def _smart_cleanup_temp_files(self, current_task_id: str, current_audio_path: str):
         """智能清理临时文件：委托 FileManager 递归清理超出保留限制的任务目录"""
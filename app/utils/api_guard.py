@@ -1,16 +1,20 @@
+import functools
 import os
 import socket
 import ipaddress
 from urllib.parse import urlparse
 
 
-def _env_bool(name: str, default: bool) -> bool:
-    val = os.environ.get(name)
+def _env_bool_value(val, default: bool) -> bool:
     if val is None:
         return default
     return str(val).strip().lower() in ("1", "true", "yes", "on")
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    return _env_bool_value(os.environ.get(name), default)
+
+
 def _is_private_like_ip(ip_obj: ipaddress._BaseAddress) -> bool:
     return bool(
         ip_obj.is_private
@@ -83,24 +87,47 @@ def is_safe_base_url(url: str, *,
     except Exception:
         return False
 
+_POLICY_ENV_KEYS = (
+    'ALLOWED_API_HOSTS',
+    'ALLOW_INSECURE_HTTP',
+    'ALLOW_PRIVATE_ADDRESSES',
+    'ENFORCE_API_HOSTS_WHITELIST',
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _derive_security_policy(env_values: tuple, cfg_hosts: tuple, cfg_http: bool,
+                            cfg_private: bool, cfg_whitelist: bool):
+    """按（环境变量, 配置值）快照推导策略；输入不变时直接命中缓存。"""
+    env_hosts_raw, env_http, env_private, env_whitelist = env_values
+    env_hosts = [h.strip().lower() for h in (env_hosts_raw or '').split(',') if h.strip()]
+    allowed_hosts = tuple({*(h.lower() for h in cfg_hosts), *env_hosts})
+    return (
+        allowed_hosts,
+        _env_bool_value(env_http, cfg_http),
+        _env_bool_value(env_private, cfg_private),
+        _env_bool_value(env_whitelist, cfg_whitelist),
+    )
+
+
 def get_security_policy():
     """提取当前安全策略（环境变量优先，配置兜底）。
     返回: (allowed_hosts, allow_http, allow_private, enforce_whitelist)
     """
     try:
         from app.config.settings import Config
+        # 每次重新读取配置，config.yaml 的 security 修改无需重启即可生效；只缓存推导结果
         cfg = Config.load_config()
         sec = (cfg.get('security') or {})
-        cfg_hosts = sec.get('allowed_api_hosts', []) or []
-        env_hosts = [
-            h.strip().lower()
-            for h in os.environ.get('ALLOWED_API_HOSTS', '').split(',')
-            if h.strip()
-        ]
-        allowed_hosts = list({*(h.lower() for h in cfg_hosts if isinstance(h, str)), *env_hosts})
-        allow_http = _env_bool('ALLOW_INSECURE_HTTP', bool(sec.get('allow_insecure_http', True)))
-        allow_private = _env_bool('ALLOW_PRIVATE_ADDRESSES', bool(sec.get('allow_private_addresses', True)))
-        enforce_whitelist = _env_bool('ENFORCE_API_HOSTS_WHITELIST', bool(sec.get('enforce_api_hosts_whitelist', False)))
+        allowed_hosts, allow_http, allow_private, enforce_whitelist = _derive_security_policy(
+            tuple(os.environ.get(k) for k in _POLICY_ENV_KEYS),
+            tuple(h for h in (sec.get('allowed_api_hosts', []) or []) if isinstance(h, str)),
+            bool(sec.get('allow_insecure_http', True)),
+            bool(sec.get('allow_private_addresses', True)),
+            bool(sec.get('enforce_api_hosts_whitelist', False)),
+        )
+        # 返回新列表，调用方修改不会污染缓存
+        allowed_hosts = list(allowed_hosts)
     except Exception:
         allowed_hosts = []
         allow_http = True
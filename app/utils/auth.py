@@ -1,9 +1,12 @@
 from functools import wraps
 from flask import request, jsonify
+import hmac
 import os
 import logging
 from app.config.settings import Config
 
+logger = logging.getLogger(__name__)
+
 
 def _load_admin_token() -> str:
     """加载管理员令牌（可选）。优先环境变量，其次配置文件。
@@ -80,13 +83,15 @@ def admin_protected(f):
         if not token:
             global _warned_no_admin
             if _is_production() and not _warned_no_admin:
-                logging.warning('安全提示：生产环境未配置 ADMIN_TOKEN，破坏性接口当前未受保护。建议设置 ADMIN_TOKEN 或启用 ENFORCE_ADMIN_TOKEN。')
+                logger.warning('安全提示：生产环境未配置 ADMIN_TOKEN，破坏性接口当前未受保护。建议设置 ADMIN_TOKEN 或启用 ENFORCE_ADMIN_TOKEN。')
                 _warned_no_admin = True
             return f(*args, **kwargs)
 
-        # 校验令牌
+        # 校验令牌（常量时间比较）
         presented = request.headers.get('X-Admin-Token', '').strip()
-        if not presented or presented != token:
+        if not presented or not hmac.compare_digest(
+            presented.encode('utf-8'), token.encode('utf-8')
+        ):
             return (
                 jsonify(
                     {
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from typing import Any
 
 SENSITIVE_KEY_FRAGMENTS = (
@@ -18,9 +19,15 @@ SENSITIVE_KEY_FRAGMENTS = (
 )
 
 
+# All fragments folded into one pattern, compiled once at import time
+_SENSITIVE_KEY_RE = re.compile(
+    "|".join(re.escape(fragment) for fragment in SENSITIVE_KEY_FRAGMENTS),
+    re.IGNORECASE,
+)
+
+
 def is_sensitive_key(key: str) -> bool:
-    lowered = (key or "").lower()
-    return any(fragment in lowered for fragment in SENSITIVE_KEY_FRAGMENTS)
+    return _SENSITIVE_KEY_RE.search(key or "") is not None
 
 
 def mask_sensitive_data(value: Any, key: str | None = None) -> Any:
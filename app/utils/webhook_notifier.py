@@ -26,14 +26,60 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_BARK_SERVER = "https://api.day.app"
 
+# Providers are independent network round-trips; fan them out so the total
+# latency is the slowest provider rather than the sum of all of them.
+_WH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wh")
+# Upper bound for waiting on the fan-out; each provider has its own request timeout.
+_WH_WAIT_TIMEOUT = 30
+
+# Provider name -> (WebhookNotifier sender method, config key of the target
+# URL checked in strict mode). Adding a provider is one entry plus a sender.
+_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "bark": ("_send_bark", "server"),
+    "wecom": ("_send_wecom", "webhook_url"),
+}
+
+# Shared keep-alive session so repeated notifications reuse TCP/TLS connections.
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Return the process-wide webhook session, creating it on first use."""
+
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                # One quick retry on gateway errors; POST is not retried (urllib3
+                # default allowed_methods), and the last response is returned
+                # rather than raised so Bark can still fall back to /push.
+                retry = Retry(
+                    total=1,
+                    backoff_factor=0.1,
+                    status_forcelist=(502, 503, 504),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
 
 def _env_bool(name: str, default: bool = False) -> bool:
     v = os.environ.get(name)
@@ -65,10 +111,12 @@ def _should_enforce_webhook_url_safety() -> bool:
 def _merge_dict(
     base: Optional[Dict[str, Any]], override: Optional[Dict[str, Any]]
 ) -> Dict[str, Any]:
-    """Shallow merge with one-level nested dict support.
+    """Deep merge of webhook configs.
 
     Values in override win; nested dicts are merged recursively.
-    None in override does not erase base values.
+    None in override does not erase base values, at any depth.
+    Only dicts on an overridden path are copied; untouched sub-dicts are
+    shared with base (callers treat the result as read-only).
     """
 
     result: Dict[str, Any] = dict(base or {})
@@ -76,11 +124,12 @@ def _merge_dict(
         return result
 
     for key, value in override.items():
-        if isinstance(value, dict) and isinstance(result.get(key), dict):
-            nested = dict(result[key])
-            nested.update(value)
-            result[key] = nested
-        elif value is not None:
+        if value is None:
+            continue
+        current = result.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            result[key] = _merge_dict(current, value)
+        else:
             result[key] = value
     return result
 
@@ -141,6 +190,12 @@ class WebhookNotifier:
         if not cfg.get("enabled", False):
             return
 
+        provider_cfgs = {name: cfg.get(name) or {} for name in _PROVIDERS}
+        enabled = {name: sub for name, sub in provider_cfgs.items() if sub.get("enabled")}
+        if not enabled:
+            # No provider switched on: skip URL/brief building and strict checks.
+            return
+
         base_url = (cfg.get("base_url") or "").strip() or None
         task_url = None
         if base_url:
@@ -148,9 +203,6 @@ class WebhookNotifier:
             task_url = base_url.rstrip("/") + "/"
             task_url += f"?task_id={getattr(task, 'id', '')}"
 
-        bark_cfg = cfg.get("bark") or {}
-        wecom_cfg = cfg.get("wecom") or {}
-
         # Strict mode (opt-in): validate webhook targets using the repo's security policy.
         # We intentionally do NOT reuse allowed_api_hosts whitelist here (that's for API base_url).
         if _should_enforce_webhook_url_safety():
@@ -161,59 +213,67 @@ class WebhookNotifier:
                     get_security_policy()
                 )
 
-                bark_server = str(bark_cfg.get("server") or "").strip()
-                if bark_cfg.get("enabled") and bark_server:
-                    if not is_safe_base_url(
-                        bark_server,
+                for name, sub in list(enabled.items()):
+                    url_key = _PROVIDERS[name][1]
+                    target = str(sub.get(url_key) or "").strip()
+                    if target and not is_safe_base_url(
+                        target,
                         allowed_hosts=[],
                         allow_http=allow_http,
                         allow_private=allow_private,
                         enforce_whitelist=False,
                     ):
+                        # Target may embed a secret (WeCom key), so it is not logged.
                         logger.warning(
-                            "skip Bark webhook: unsafe server url under strict mode (%s)",
-                            bark_server,
+                            "skip %s webhook: unsafe %s under strict mode", name, url_key
                         )
-                        # Disable this provider for this call
-                        bark_cfg = dict(bark_cfg)
-                        bark_cfg["enabled"] = False
-
-                wecom_url = str(wecom_cfg.get("webhook_url") or "").strip()
-                if wecom_cfg.get("enabled") and wecom_url:
-                    if not is_safe_base_url(
-                        wecom_url,
-                        allowed_hosts=[],
-                        allow_http=allow_http,
-                        allow_private=allow_private,
-                        enforce_whitelist=False,
-                    ):
-                        logger.warning(
-                            "skip WeCom webhook: unsafe webhook_url under strict mode",
-                        )
-                        wecom_cfg = dict(wecom_cfg)
-                        wecom_cfg["enabled"] = False
+                        del enabled[name]
             except Exception as exc:
                 logger.warning("webhook strict validation failed: %s", exc)
 
         brief = _build_task_brief(task)
-        title = bark_cfg.get("title") or "VideoWhisper 任务完成"
-
-        if bark_cfg.get("enabled"):
-            self._send_bark(
-                bark_cfg,
-                title=title,
-                body=brief,
-                task_url=task_url,
-                task_id=getattr(task, "id", ""),
+        title = provider_cfgs["bark"].get("title") or "VideoWhisper 任务完成"
+        task_id = getattr(task, "id", "")
+
+        jobs: List[Callable[..., None]] = []
+        for name, sub in enabled.items():
+            sender = getattr(self, _PROVIDERS[name][0])
+            jobs.append(
+                partial(
+                    sender,
+                    sub,
+                    title=title,
+                    body=brief,
+                    task_url=task_url,
+                    task_id=task_id,
+                )
             )
 
-        if wecom_cfg.get("enabled"):
-            self._send_wecom(
-                wecom_cfg,
-                title=title,
-                body=brief,
-                task_url=task_url,
-                task_id=getattr(task, "id", ""),
+        self._run_jobs(jobs, task_id=task_id)
+
+    @staticmethod
+    def _run_jobs(jobs: List[Callable[..., None]], *, task_id: str) -> None:
+        """Run provider sends, in parallel when there is more than one."""
+
+        if not jobs:
+            return
+        if len(jobs) == 1:
+            jobs[0]()
+            return
+
+        futures = [_WH_POOL.submit(job) for job in jobs]
+        done, not_done = wait(futures, timeout=_WH_WAIT_TIMEOUT)
+        for future in done:
+            # Providers log their own failures; this only guards unexpected errors.
+            exc = future.exception()
+            if exc is not None:
+                logger.warning("webhook for task %s raised error: %s", task_id, exc)
+        if not_done:
+            logger.warning(
+                "webhook for task %s: %d provider(s) still running after %ss",
+                task_id,
+                len(not_done),
+                _WH_WAIT_TIMEOUT,
             )
 
     # Provider specific helpers -------------------------------------------------
@@ -259,7 +319,7 @@ class WebhookNotifier:
                 params["url"] = task_url
 
             timeout = float(cfg.get("timeout", 5))
-            resp = requests.get(url, params=params, timeout=timeout)
+            resp = _get_session().get(url, params=params, timeout=timeout)
             if resp.status_code >= 400:
                 logger.warning(
                     "Bark webhook for task %s GET failed: %s %s",
@@ -278,7 +338,7 @@ class WebhookNotifier:
                         payload["group"] = group
                     if task_url:
                         payload["url"] = task_url
-                    post_resp = requests.post(push_url, json=payload, timeout=timeout)
+                    post_resp = _get_session().post(push_url, json=payload, timeout=timeout)
                     if post_resp.status_code >= 400:
                         logger.warning(
                             "Bark webhook for task %s POST /push failed: %s %s",
@@ -311,28 +371,24 @@ class WebhookNotifier:
             logger.warning("WeCom webhook enabled but webhook_url is empty; skip")
             return
 
-        lines = [title, "", body]
+        # One join over a fixed tuple; the link block is appended only when present.
         if task_url:
-            lines.extend(["", f"结果链接: {task_url}"])
-        content = "\n".join(lines)
-
-        payload: Dict[str, Any] = {
-            "msgtype": "text",
-            "text": {
-                "content": content,
-            },
-        }
+            content = "\n".join((title, "", body, "", f"结果链接: {task_url}"))
+        else:
+            content = "\n".join((title, "", body))
 
+        text: Dict[str, Any] = {"content": content}
         mobiles = cfg.get("mentioned_mobile_list") or cfg.get("mobiles") or []
         userids = cfg.get("mentioned_userid_list") or cfg.get("userids") or []
         if mobiles:
-            payload["text"]["mentioned_mobile_list"] = list(mobiles)
+            text["mentioned_mobile_list"] = list(mobiles)
         if userids:
-            payload["text"]["mentioned_userid_list"] = list(userids)
+            text["mentioned_userid_list"] = list(userids)
+        payload: Dict[str, Any] = {"msgtype": "text", "text": text}
 
         try:
             timeout = float(cfg.get("timeout", 5))
-            resp = requests.post(webhook_url, json=payload, timeout=timeout)
+            resp = _get_session().post(webhook_url, json=payload, timeout=timeout)
             if resp.status_code != 200:
                 logger.warning(
                     "WeCom webhook for task %s failed: %s %s",
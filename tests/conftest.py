@@ -1,11 +1,72 @@
 import os
+import types
 
 import pytest
+from flask import Flask
 
+import app.config.settings as settings
+import app.main as main
+import app.utils.auth as auth
 from app import create_app
 from app.config.settings import Config
 
 
+# Minimal system config for services that only need dirs and audio settings
+_DEFAULT_CFG = {
+    "system": {
+        "temp_dir": "temp",
+        "output_dir": "output",
+        "audio_format": "wav",
+        "audio_sample_rate": 16000,
+    }
+}
+
+
+# threading stand-in whose Thread(...).start() calls the target inline
+SYNC_THREADING = types.SimpleNamespace(
+    Thread=lambda target, daemon=None: types.SimpleNamespace(
+        start=target, daemon=daemon
+    )
+)
+
+
+def _bare_app():
+    """Minimal Flask app for decorator tests: no static route, no key sorting."""
+
+    app = Flask("t", static_folder=None)
+    app.config["TESTING"] = True
+    app.json.sort_keys = False
+    return app
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "slow: expensive setup (e.g. RSA keygen); scheduled in its own file"
+    )
+    config.addinivalue_line(
+        "markers",
+        "thread_safe: pure logic, no shared state; may run on any xdist worker",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Under `--dist loadgroup` keep each module's stateful tests on one worker,
+    # and let thread_safe tests spread freely across workers.
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        if item.get_closest_marker("thread_safe") is None:
+            item.add_marker(pytest.mark.xdist_group(item.module.__name__))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _reset_worker_globals():
+    """Start each (xdist) worker process from clean module-level state."""
+
+    Config._config_cache = None
+    auth._warned_no_admin = False
+
+
 @pytest.fixture(autouse=True)
 def _restore_selected_env(monkeypatch):
     """Keep a small set of security-related env vars isolated per test."""
@@ -32,6 +93,97 @@ def _restore_selected_env(monkeypatch):
             monkeypatch.setenv(k, v)
 
 
+@pytest.fixture(autouse=True)
+def _no_disk_save(monkeypatch):
+    """Never let the shared app.main video_processor write tasks.json to disk."""
+
+    monkeypatch.setattr(
+        main.video_processor, "save_tasks_to_disk", lambda: None, raising=False
+    )
+
+
+@pytest.fixture(scope="session")
+def _shared_rsa_key():
+    """One RSA key per session; cert tests only inspect subject/issuer/SAN."""
+
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key_size = 1024 if os.environ.get("PYTEST_FAST") == "1" else 2048
+    return rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+
+
+@pytest.fixture
+def cert_config(tmp_path):
+    """Factory for CertificateManager configs writing cert/key under tmp_path."""
+
+    def _make(auto_generate=True):
+        return {
+            "cert_file": str(tmp_path / "cert.pem"),
+            "key_file": str(tmp_path / "key.pem"),
+            "domain": "example.com",
+            "country": "US",
+            "state": "CA",
+            "organization": "Example Org",
+            "auto_generate": auto_generate,
+        }
+
+    return _make
+
+
+@pytest.fixture
+def shared_rsa_keygen(monkeypatch, _shared_rsa_key):
+    """Make CertificateManager reuse the session RSA key instead of generating one."""
+
+    monkeypatch.setattr(
+        "app.utils.certificate_manager.rsa.generate_private_key",
+        lambda **kwargs: _shared_rsa_key,
+    )
+
+
+@pytest.fixture(scope="session")
+def bare_app():
+    """bare_app(): build a minimal Flask app for decorator tests."""
+
+    return _bare_app
+
+
+@pytest.fixture
+def vp():
+    """The app.main VideoProcessor instance that API handlers use."""
+
+    return main.video_processor
+
+
+@pytest.fixture(scope="session")
+def shared_root(tmp_path_factory):
+    """Session-wide scratch dir for tests that only need a path, never write."""
+
+    return tmp_path_factory.mktemp("shared")
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Apply a mapping of env vars via monkeypatch, optionally clearing keys first."""
+
+    def _apply(mapping, clear=()):
+        for key in clear:
+            monkeypatch.delenv(key, raising=False)
+        for key, value in mapping.items():
+            monkeypatch.setenv(key, value)
+
+    return _apply
+
+
+@pytest.fixture
+def tmp_config(tmp_path, monkeypatch):
+    """Root the project at tmp_path and serve _DEFAULT_CFG from Config.load_config."""
+
+    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: _DEFAULT_CFG))
+    Config._config_cache = None
+    return tmp_path
+
+
 @pytest.fixture
 def app_config(tmp_path, monkeypatch):
     """Provide a minimal but realistic config dict for create_app()."""
@@ -107,3 +259,10 @@ def api_app(app_config):
 @pytest.fixture
 def client(api_app):
     return api_app.test_client()
+
+
+@pytest.fixture
+def sync_threading(monkeypatch):
+    """Make background threads spawned by app.main run synchronously."""
+
+    monkeypatch.setattr(main, "threading", SYNC_THREADING)
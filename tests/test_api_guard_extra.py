@@ -68,3 +68,28 @@ def test_get_security_policy_env_overrides_booleans(tmp_path, monkeypatch):
     assert allow_http is True
     assert allow_private is True
     assert enforce_whitelist is False
+
+
+def test_get_security_policy_caches_derivation_but_tracks_env_and_config(monkeypatch):
+    cfg = {"security": {"allowed_api_hosts": ["Api.Example.com", 123]}}
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+    for key in api_guard._POLICY_ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    api_guard._derive_security_policy.cache_clear()
+
+    first = api_guard.get_security_policy()
+    second = api_guard.get_security_policy()
+    assert first == (["api.example.com"], True, True, False)
+    assert second == first
+    assert api_guard._derive_security_policy.cache_info().hits == 1
+    # callers get their own list, so mutating it cannot poison the cache
+    first[0].append("evil.example")
+    assert api_guard.get_security_policy()[0] == ["api.example.com"]
+
+    # an env change is a different cache key and takes effect immediately
+    monkeypatch.setenv("ALLOW_INSECURE_HTTP", "false")
+    assert api_guard.get_security_policy()[1] is False
+
+    # config.yaml is re-read on every call, so security edits apply without a restart
+    cfg["security"] = {"allowed_api_hosts": ["other.example.com"]}
+    assert api_guard.get_security_policy()[0] == ["other.example.com"]
@@ -1,20 +1,48 @@
-﻿import os
+﻿import copy
 import types
+from unittest import mock
 
 import pytest
 
 import app.main as main
-
-
-def test_translate_requires_body_and_task_id(client):
-    # Empty JSON, missing task_id
-    resp = client.post("/api/translate", json={})
-    assert resp.status_code == 400
-    data = resp.get_json()
-    assert data["success"] is False
-
-
-def test_translate_bilingual_happy_path(client, monkeypatch):
+from app.models.data_models import VideoInfo
+
+
+_TASK_TEMPLATE = types.SimpleNamespace(
+    id="",
+    status="completed",
+    video_info=None,
+    video_url="",
+    transcript="",
+    summary={},
+    analysis={},
+    translation_ready=False,
+    progress=0,
+    progress_stage="",
+    progress_detail="",
+    error_message="",
+    created_at=None,
+)
+
+_VIDEO_INFO_TEMPLATE = VideoInfo(
+    title="Test Video",
+    url="https://example.com/v",
+    duration=10.0,
+    uploader="u",
+    description="",
+)
+
+
+def _make_task(**overrides):
+    """Copy the task template and apply per-test attribute overrides."""
+
+    task = copy.copy(_TASK_TEMPLATE)
+    for key, value in overrides.items():
+        setattr(task, key, value)
+    return task
+
+
+def test_translate_bilingual_happy_path(client, monkeypatch, sync_threading):
     calls = {}
 
     def fake_translate(task_id, llm_provider, api_config):  # noqa: D401
@@ -27,18 +55,6 @@ def test_translate_bilingual_happy_path(client, monkeypatch):
         types.SimpleNamespace(translate_transcript=fake_translate),
     )
 
-    # Replace threading.Thread so we can run the target synchronously
-    class DummyThread:
-        def __init__(self, target, daemon=None):  # noqa: D401
-            self._target = target
-            self.daemon = daemon
-
-        def start(self):  # noqa: D401
-            # run inline to keep test deterministic
-            self._target()
-
-    monkeypatch.setattr(main, "threading", types.SimpleNamespace(Thread=DummyThread))
-
     payload = {"task_id": "t-1", "llm_provider": "prov", "api_config": {"a": 1}}
     resp = client.post("/api/translate", json=payload)
     assert resp.status_code == 200
@@ -49,46 +65,36 @@ def test_translate_bilingual_happy_path(client, monkeypatch):
     assert calls["args"] == ("t-1", "prov", {"a": 1})
 
 
-def test_get_result_missing_and_not_completed(client, monkeypatch):
+def test_get_result_missing_and_not_completed(client, monkeypatch, vp):
     # Missing task
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: None)
+    monkeypatch.setattr(vp, "get_task", lambda tid: None)
     resp = client.get("/api/result/unknown")
     assert resp.status_code == 400
     data = resp.get_json()
     assert data["success"] is False
 
     # Task exists but not completed
-    task = types.SimpleNamespace(status="processing")
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task)
+    task = _make_task(status="processing")
+    monkeypatch.setattr(vp, "get_task", lambda tid: task)
     resp2 = client.get("/api/result/abc")
     assert resp2.status_code == 400
     data2 = resp2.get_json()
     assert data2["success"] is False
 
 
-def test_get_result_completed_with_and_without_translation(tmp_path, client, monkeypatch):
-    from app.models.data_models import VideoInfo
-
+def test_get_result_completed_with_and_without_translation(tmp_path, client, monkeypatch, vp):
     # Completed task without translation, transcript should be returned
     task_id = "t-ok"
-    task = types.SimpleNamespace(
+    task = _make_task(
         id=task_id,
-        status="completed",
-        video_info=VideoInfo(
-            title="Test Video",
-            url="https://example.com/v",
-            duration=10.0,
-            uploader="u",
-            description="",
-        ),
+        video_info=_VIDEO_INFO_TEMPLATE,
         video_url="https://example.com/v",
         transcript="plain transcript",
         summary={"s": "v"},
         analysis={"k": 1},
-        translation_ready=False,
     )
 
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task)
+    monkeypatch.setattr(vp, "get_task", lambda tid: task)
     resp = client.get(f"/api/result/{task_id}")
     assert resp.status_code == 200
     data = resp.get_json()
@@ -98,21 +104,17 @@ def test_get_result_completed_with_and_without_translation(tmp_path, client, mon
 
     # Completed task with translation_ready and a bilingual file on disk
     task_id2 = "t-trl"
-    task2 = types.SimpleNamespace(
+    task2 = _make_task(
         id=task_id2,
-        status="completed",
-        video_info=None,
         video_url="https://example.com/v2",
         transcript="original transcript",
-        summary={},
-        analysis={},
         translation_ready=True,
     )
 
     out_dir = tmp_path / "out"
     out_dir.mkdir()
-    monkeypatch.setattr(main.video_processor, "output_dir", str(out_dir))
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task2)
+    monkeypatch.setattr(vp, "output_dir", str(out_dir))
+    monkeypatch.setattr(vp, "get_task", lambda tid: task2)
 
     task_dir = out_dir / task_id2
     task_dir.mkdir()
@@ -128,40 +130,28 @@ def test_get_result_completed_with_and_without_translation(tmp_path, client, mon
     assert data2["data"]["bilingual_transcript"] == bilingual_text
 
 
-def test_download_file_requires_completed_task_and_supports_transcript(tmp_path, client, monkeypatch):
-    from app.models.data_models import VideoInfo
-
+def test_download_file_requires_completed_task_and_supports_transcript(tmp_path, client, monkeypatch, vp):
     # Task not found or not completed -> generic failure
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: None)
+    monkeypatch.setattr(vp, "get_task", lambda tid: None)
     resp = client.get("/api/download/nope/transcript")
     assert resp.status_code == 200
     assert resp.get_json()["success"] is False
 
     # Unsupported file_type -> explicit error
-    task = types.SimpleNamespace(status="completed", video_info=None)
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task)
+    task = _make_task()
+    monkeypatch.setattr(vp, "get_task", lambda tid: task)
     resp2 = client.get("/api/download/t1/unknown")
     assert resp2.status_code == 200
     assert resp2.get_json()["success"] is False
 
     # Happy path: transcript download prefers original transcript
     task_id = "t-dl"
-    task3 = types.SimpleNamespace(
-        id=task_id,
-        status="completed",
-        video_info=VideoInfo(
-            title="Video Title",
-            url="https://example.com/v",
-            duration=10.0,
-            uploader="u",
-            description="",
-        ),
-    )
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task3)
+    task3 = _make_task(id=task_id, video_info=_VIDEO_INFO_TEMPLATE)
+    monkeypatch.setattr(vp, "get_task", lambda tid: task3)
 
     out_dir = tmp_path / "out"
     out_dir.mkdir()
-    monkeypatch.setattr(main.video_processor, "output_dir", str(out_dir))
+    monkeypatch.setattr(vp, "output_dir", str(out_dir))
 
     task_dir = out_dir / task_id
     task_dir.mkdir()
@@ -184,29 +174,20 @@ def test_download_file_requires_completed_task_and_supports_transcript(tmp_path,
     assert resp4.get_data(as_text=True) == "bilingual content"
 
 
-def test_download_file_generates_analysis_for_legacy_task(tmp_path, client, monkeypatch):
-    from app.models.data_models import VideoInfo
-
+def test_download_file_generates_analysis_for_legacy_task(tmp_path, client, monkeypatch, vp):
     task_id = "t-analysis"
-    task = types.SimpleNamespace(
+    task = _make_task(
         id=task_id,
-        status="completed",
         video_url="https://example.com/v",
-        video_info=VideoInfo(
-            title="Video Title",
-            url="https://example.com/v",
-            duration=10.0,
-            uploader="uploader",
-            description="",
-        ),
+        video_info=_VIDEO_INFO_TEMPLATE,
         analysis={"content_type": "测评", "main_topics": ["主题A", "主题B"]},
         created_at=main.datetime(2024, 1, 2, 3, 4, 5),
     )
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task)
+    monkeypatch.setattr(vp, "get_task", lambda tid: task)
 
     out_dir = tmp_path / "out"
     out_dir.mkdir()
-    monkeypatch.setattr(main.video_processor, "output_dir", str(out_dir))
+    monkeypatch.setattr(vp, "output_dir", str(out_dir))
 
     task_dir = out_dir / task_id
     task_dir.mkdir()
@@ -218,38 +199,31 @@ def test_download_file_generates_analysis_for_legacy_task(tmp_path, client, monk
     assert (task_dir / "analysis.md").exists()
 
 
-def test_list_tasks_returns_sorted_data(client, monkeypatch):
+def test_list_tasks_returns_sorted_data(client, monkeypatch, vp):
     from datetime import datetime, timedelta
 
     base = datetime(2024, 1, 1, 12, 0, 0)
 
-    task_old = types.SimpleNamespace(
+    task_old = _make_task(
         id="t-old",
         video_url="https://example.com/old",
-        status="completed",
         progress=100,
-        video_info=None,
         created_at=base,
-        error_message="",
     )
-    task_new = types.SimpleNamespace(
+    task_new = _make_task(
         id="t-new",
         video_url="https://example.com/new",
         status="processing",
         progress=10,
-        video_info=None,
         created_at=base + timedelta(minutes=5),
-        error_message="",
     )
 
-    monkeypatch.setattr(
-        main.video_processor,
-        "tasks",
+    with mock.patch.dict(
+        vp.tasks,
         {task_old.id: task_old, task_new.id: task_new},
-        raising=False,
-    )
-
-    resp = client.get("/api/tasks")
+        clear=True,
+    ):
+        resp = client.get("/api/tasks")
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["success"] is True
@@ -258,31 +232,32 @@ def test_list_tasks_returns_sorted_data(client, monkeypatch):
     assert ids == ["t-new", "t-old"]
 
 
-def test_list_files_includes_output_and_temp_files(tmp_path, client, monkeypatch):
+def test_list_files_includes_output_and_temp_files(tmp_path, client, monkeypatch, vp):
     # Point processor dirs to temp paths
     out_dir = tmp_path / "out"
     temp_dir = tmp_path / "temp"
     out_dir.mkdir()
     temp_dir.mkdir(exist_ok=True)
 
-    monkeypatch.setattr(main.video_processor, "output_dir", str(out_dir))
-    monkeypatch.setattr(main.video_processor, "temp_dir", str(temp_dir))
+    monkeypatch.setattr(vp, "output_dir", str(out_dir))
+    monkeypatch.setattr(vp, "temp_dir", str(temp_dir))
 
-    # Prepare one output file under a task id and one temp file
+    # Prepare one output file under a task id and one temp file; the listing
+    # only stats entries, so empty files are enough
     task_id = "t1"
     task_dir = out_dir / task_id
     task_dir.mkdir()
     summary_file = task_dir / "summary_report.md"
-    summary_file.write_text("summary", encoding="utf-8")
+    summary_file.touch()
     transcript_file = task_dir / "transcript.md"
-    transcript_file.write_text("transcript", encoding="utf-8")
+    transcript_file.touch()
 
     temp_file = temp_dir / "temp_audio.wav"
-    temp_file.write_bytes(b"data")
+    temp_file.touch()
 
     # Stub get_task so file listing can resolve task title
-    task = types.SimpleNamespace(id=task_id, video_info=None)
-    monkeypatch.setattr(main.video_processor, "get_task", lambda tid: task)
+    task = _make_task(id=task_id)
+    monkeypatch.setattr(vp, "get_task", lambda tid: task)
 
     resp = client.get("/api/files")
     assert resp.status_code == 200
@@ -304,7 +279,7 @@ def test_favicon_route_serves_svg_icon(client):
     assert b"<svg" in resp.data
 
 
-def test_delete_task_files_uses_filemanager_and_updates_tasks(tmp_path, client, monkeypatch):
+def test_delete_task_files_uses_filemanager_and_updates_tasks(tmp_path, client, monkeypatch, vp):
     from app.services.file_manager import FileManager
 
     # Admin protection: configure token and production env
@@ -324,22 +299,29 @@ def test_delete_task_files_uses_filemanager_and_updates_tasks(tmp_path, client,
 
     # Prepare video_processor tasks
     task_id = "t-del"
-    main.video_processor.tasks[task_id] = types.SimpleNamespace()
-
-    # Avoid touching real disk
-    monkeypatch.setattr(main.video_processor, "save_tasks_to_disk", lambda: None)
-
-    resp = client.post(
-        f"/api/files/delete-task/{task_id}",
-        headers={"X-Admin-Token": "secret"},
-    )
-    assert resp.status_code == 200
-    data = resp.get_json()
-    assert data["success"] is True
-    assert task_id not in main.video_processor.tasks
-
-
-def test_stop_all_tasks_marks_processing_failed(client, monkeypatch):
+    with mock.patch.dict(
+        vp.tasks, {task_id: _make_task(id=task_id)}, clear=True
+    ):
+        resp = client.post(
+            f"/api/files/delete-task/{task_id}",
+            headers={"X-Admin-Token": "secret"},
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["success"] is True
+        assert task_id not in vp.tasks
+
+
+@pytest.mark.parametrize(
+    "cancelled",
+    [
+        # No processing tasks
+        [],
+        # cancel_all_processing returns both ids, but handler only flips those still processing
+        ["task-processing", "task-completed"],
+    ],
+)
+def test_stop_all_tasks(client, monkeypatch, vp, cancelled):
     # Admin protection
     monkeypatch.setenv("ADMIN_TOKEN", "secret")
     monkeypatch.setenv("FLASK_ENV", "production")
@@ -347,69 +329,39 @@ def test_stop_all_tasks_marks_processing_failed(client, monkeypatch):
     t1 = "task-processing"
     t2 = "task-completed"
 
-    task1 = types.SimpleNamespace(
+    task1 = _make_task(
         id=t1,
         status="processing",
         progress=50,
         progress_stage="processing",
         progress_detail="...",
-        error_message="",
-    )
-    task2 = types.SimpleNamespace(
-        id=t2,
-        status="completed",
-        progress=100,
-        progress_stage="done",
-        progress_detail="",
-        error_message="",
     )
+    task2 = _make_task(id=t2, progress=100, progress_stage="done")
 
-    main.video_processor.tasks[t1] = task1
-    main.video_processor.tasks[t2] = task2
-
-    # cancel_all_processing should return both ids, but handler only flips those still processing
-    monkeypatch.setattr(
-        main.video_processor,
-        "cancel_all_processing",
-        lambda: [t1, t2],
-    )
-    monkeypatch.setattr(main.video_processor, "save_tasks_to_disk", lambda: None)
+    monkeypatch.setattr(vp, "cancel_all_processing", lambda: cancelled)
 
-    resp = client.post(
-        "/api/stop-all-tasks",
-        headers={"X-Admin-Token": "secret"},
-    )
+    with mock.patch.dict(vp.tasks, {t1: task1, t2: task2}, clear=True):
+        resp = client.post(
+            "/api/stop-all-tasks",
+            headers={"X-Admin-Token": "secret"},
+        )
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["success"] is True
-    assert t1 in data["data"]["stopped_tasks"]
-
-    # task1 should be marked failed; task2 untouched
-    assert task1.status == "failed"
-    # error_message should be a non-empty string
-    assert isinstance(task1.error_message, str) and task1.error_message
-    assert "用户手动停止" in task1.error_message
+    assert data["data"]["stopped_tasks"] == cancelled
+
+    if cancelled:
+        # task1 should be marked failed with a non-empty error message
+        assert task1.status == "failed"
+        assert isinstance(task1.error_message, str) and task1.error_message
+        assert "用户手动停止" in task1.error_message
+    else:
+        assert task1.status == "processing"
+    # task2 untouched
     assert task2.status == "completed"
 
 
-def test_stop_all_tasks_when_no_processing(client, monkeypatch):
-    monkeypatch.setenv("ADMIN_TOKEN", "secret")
-    monkeypatch.setenv("FLASK_ENV", "production")
-
-    # No processing tasks
-    monkeypatch.setattr(main.video_processor, "cancel_all_processing", lambda: [])
-
-    resp = client.post(
-        "/api/stop-all-tasks",
-        headers={"X-Admin-Token": "secret"},
-    )
-    assert resp.status_code == 200
-    data = resp.get_json()
-    assert data["success"] is True
-    assert data["data"]["stopped_tasks"] == []
-
-
-def test_delete_task_record_uses_filemanager_and_cleans_memory(client, monkeypatch):
+def test_delete_task_record_uses_filemanager_and_cleans_memory(client, monkeypatch, vp):
     # Admin protection
     monkeypatch.setenv("ADMIN_TOKEN", "secret")
     monkeypatch.setenv("FLASK_ENV", "production")
@@ -428,14 +380,14 @@ def test_delete_task_record_uses_filemanager_and_cleans_memory(client, monkeypat
     monkeypatch.setattr(main, "FileManager", DummyFM)
 
     task_id = "t-rec"
-    main.video_processor.tasks[task_id] = types.SimpleNamespace()
-    monkeypatch.setattr(main.video_processor, "save_tasks_to_disk", lambda: None)
-
-    resp = client.post(
-        f"/api/tasks/delete/{task_id}",
-        headers={"X-Admin-Token": "secret"},
-    )
-    assert resp.status_code == 200
-    data = resp.get_json()
-    assert data["success"] is True
-    assert task_id not in main.video_processor.tasks
+    with mock.patch.dict(
+        vp.tasks, {task_id: _make_task(id=task_id)}, clear=True
+    ):
+        resp = client.post(
+            f"/api/tasks/delete/{task_id}",
+            headers={"X-Admin-Token": "secret"},
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["success"] is True
+        assert task_id not in vp.tasks
@@ -1,6 +1,11 @@
+import pytest
+
 import app.main as main
 
 
+_SF_CONFIG = {"provider": "siliconflow", "config": {"api_key": "k"}}
+
+
 def test_test_connection_requires_provider(client):
     resp = client.post("/api/test-connection", json={"config": {}})
     assert resp.status_code == 400
@@ -18,35 +23,24 @@ def test_test_connection_invalid_provider(client):
     assert data["success"] is False
 
 
-def test_test_connection_siliconflow_success(client, monkeypatch):
-    def fake_test(api_key, base_url, model):
-        return True, "ok"
-
-    monkeypatch.setattr(main, "_pt_test_siliconflow", fake_test)
-
-    resp = client.post(
-        "/api/test-connection",
-        json={"provider": "siliconflow", "config": {"api_key": "k"}},
-    )
-    assert resp.status_code == 200
-    data = resp.get_json()
-    assert data["success"] is True
-
-
-def test_test_connection_siliconflow_failure(client, monkeypatch):
+@pytest.mark.parametrize(
+    "ok,code",
+    [
+        (True, 200),
+        # ConnectionError propagated through api_error_handler -> 503
+        (False, 503),
+    ],
+)
+def test_test_connection_siliconflow(client, monkeypatch, ok, code):
     def fake_test(api_key, base_url, model):
-        return False, "bad"
+        return ok, "ok" if ok else "bad"
 
     monkeypatch.setattr(main, "_pt_test_siliconflow", fake_test)
 
-    resp = client.post(
-        "/api/test-connection",
-        json={"provider": "siliconflow", "config": {"api_key": "k"}},
-    )
-    # ConnectionError propagated through api_error_handler -> 503
-    assert resp.status_code == 503
+    resp = client.post("/api/test-connection", json=_SF_CONFIG)
+    assert resp.status_code == code
     data = resp.get_json()
-    assert data["success"] is False
+    assert data["success"] is ok
 
 
 def test_test_connection_requires_admin_header_when_token_set(client, monkeypatch):
@@ -56,7 +50,7 @@ def test_test_connection_requires_admin_header_when_token_set(client, monkeypatc
 
     resp = client.post(
         "/api/test-connection",
-        json={"provider": "siliconflow", "config": {"api_key": "k"}},
+        json=_SF_CONFIG,
     )
     assert resp.status_code == 403
 
@@ -68,7 +62,7 @@ def test_test_connection_requires_admin_header_when_token_set(client, monkeypatc
 
     resp2 = client.post(
         "/api/test-connection",
-        json={"provider": "siliconflow", "config": {"api_key": "k"}},
+        json=_SF_CONFIG,
         headers={"X-Admin-Token": "t"},
     )
     assert resp2.status_code == 200
@@ -1,24 +1,43 @@
+import json
 import time
 
-import app.main as main
-
-
-def test_video_info_requires_body_and_url(client):
-    # No JSON body
-    resp = client.post("/api/video-info")
-    assert resp.status_code == 400
+import pytest
 
-    # Empty JSON, missing video_url
-    resp2 = client.post("/api/video-info", json={})
-    assert resp2.status_code == 400
+import app.main as main
 
 
-def test_video_info_rejects_unsafe_url(client):
-    # Private/localhost URL should be rejected by SSRF guard
-    resp = client.post("/api/video-info", json={"video_url": "http://127.0.0.1/test"})
+_SAFE_URL = "https://example.com/video"
+_UNSAFE_URL = "http://127.0.0.1/test"
+
+# Request bodies serialized once and posted as raw bytes
+_EMPTY_JSON_BODY = b"{}"
+_UNSAFE_VIDEO_URL_BODY = json.dumps({"video_url": _UNSAFE_URL}).encode()
+_UNSAFE_URL_BODY = json.dumps({"url": _UNSAFE_URL}).encode()
+
+
+@pytest.mark.parametrize(
+    "path,body",
+    [
+        ("/api/translate", _EMPTY_JSON_BODY),
+        ("/api/video-info", None),
+        ("/api/video-info", _EMPTY_JSON_BODY),
+        # Private/localhost URL should be rejected by SSRF guard
+        ("/api/video-info", _UNSAFE_VIDEO_URL_BODY),
+        ("/api/process", None),
+        ("/api/process", _EMPTY_JSON_BODY),
+        ("/api/process", _UNSAFE_VIDEO_URL_BODY),
+        ("/api/downloads", None),
+        ("/api/downloads", _EMPTY_JSON_BODY),
+        ("/api/downloads", _UNSAFE_URL_BODY),
+    ],
+)
+def test_post_400_guards(client, path, body):
+    if body is None:
+        resp = client.post(path)
+    else:
+        resp = client.post(path, data=body, content_type="application/json")
     assert resp.status_code == 400
-    data = resp.get_json()
-    assert data["success"] is False
+    assert resp.get_json()["success"] is False
 
 
 def test_video_info_success_flow(client, monkeypatch):
@@ -28,7 +47,7 @@ def test_video_info_success_flow(client, monkeypatch):
     monkeypatch.setattr(main.video_downloader, "get_video_info", fake_get_video_info)
 
     resp = client.post(
-        "/api/video-info", json={"video_url": "https://example.com/video"}
+        "/api/video-info", json={"video_url": _SAFE_URL}
     )
     assert resp.status_code == 200
     data = resp.get_json()
@@ -36,22 +55,6 @@ def test_video_info_success_flow(client, monkeypatch):
     assert data["data"]["title"] == "Test"
 
 
-def test_process_video_requires_body_and_url(client):
-    resp = client.post("/api/process")
-    assert resp.status_code == 400
-
-    resp2 = client.post("/api/process", json={})
-    assert resp2.status_code == 400
-
-
-def test_process_video_rejects_unsafe_url(client):
-    payload = {"video_url": "http://127.0.0.1/test"}
-    resp = client.post("/api/process", json=payload)
-    assert resp.status_code == 400
-    data = resp.get_json()
-    assert data["success"] is False
-
-
 def test_process_video_success_flow_spawns_task(client, monkeypatch):
     # Avoid heavy processing by mocking VideoProcessor methods
     monkeypatch.setattr(
@@ -63,7 +66,7 @@ def test_process_video_success_flow_spawns_task(client, monkeypatch):
         main.video_processor, "process_video", lambda *args, **kwargs: None
     )
 
-    payload = {"video_url": "https://example.com/video"}
+    payload = {"video_url": _SAFE_URL}
     resp = client.post("/api/process", json=payload)
     assert resp.status_code == 200
     data = resp.get_json()
@@ -99,23 +102,6 @@ def test_get_progress_returns_api_failure_for_missing_task(client, monkeypatch):
     assert data["error"] == "任务不存在"
 
 
-def test_downloads_create_requires_body_and_url(client):
-    # No JSON body
-    resp = client.post("/api/downloads")
-    assert resp.status_code == 400
-
-    # Empty JSON
-    resp2 = client.post("/api/downloads", json={})
-    assert resp2.status_code == 400
-
-
-def test_downloads_create_rejects_unsafe_url(client):
-    resp = client.post("/api/downloads", json={"url": "http://127.0.0.1/test"})
-    assert resp.status_code == 400
-    data = resp.get_json()
-    assert data["success"] is False
-
-
 def test_downloads_create_spawns_task(client, monkeypatch):
     monkeypatch.setattr(
         main.video_processor,
@@ -126,7 +112,7 @@ def test_downloads_create_spawns_task(client, monkeypatch):
         main.video_processor, "download_video_only", lambda *args, **kwargs: None
     )
 
-    resp = client.post("/api/downloads", json={"url": "https://example.com/video"})
+    resp = client.post("/api/downloads", json={"url": _SAFE_URL})
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["success"] is True
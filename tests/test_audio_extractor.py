@@ -1,26 +1,21 @@
 ﻿import os
+import struct
 import types
 
-import app.config.settings as settings
-from app.config.settings import Config
-from app.services.audio_extractor import AudioExtractor
+import pytest
 
+from app.services import audio_extractor as ae_mod
+from app.services.audio_extractor import AudioExtractor
 
-def _patch_config_for_tmp(tmp_path, monkeypatch):
-    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
 
-    def fake_load_config():
-        return {
-            "system": {
-                "temp_dir": "temp",
-                "output_dir": "output",
-                "audio_format": "wav",
-                "audio_sample_rate": 16000,
-            }
-        }
+# Raw bytes for the fake audio file; ffmpeg.probe is stubbed so no RIFF header is needed
+_FAKE_AUDIO_BYTES = b"audio-data"
 
-    monkeypatch.setattr(Config, "load_config", staticmethod(fake_load_config))
-    Config._config_cache = None
+# 1s of 16 kHz mono 16-bit silence behind a canonical 44-byte RIFF header
+_WAV_1S_16K_MONO = struct.pack(
+    "<4sI4s4sIHHIIHH4sI",
+    b"RIFF", 36 + 32000, b"WAVE", b"fmt ", 16, 1, 1, 16000, 32000, 2, 16, b"data", 32000,
+) + b"\x00" * 32000
 
 
 def test_audio_extractor_sanitize_filename():
@@ -31,13 +26,9 @@ def test_audio_extractor_sanitize_filename():
     assert "inv" in name
 
 
-def test_extract_audio_from_video_and_cleanup(tmp_path, monkeypatch):
-    _patch_config_for_tmp(tmp_path, monkeypatch)
-
-    from app.services import audio_extractor as ae_mod
-
+def test_extract_audio_from_video_calls_ffmpeg_with_correct_args(tmp_config, monkeypatch):
     # Prepare a fake video file
-    video_path = tmp_path / "video.mp4"
+    video_path = tmp_config / "video.mp4"
     video_path.write_bytes(b"fake video")
 
     calls = {}
@@ -56,10 +47,7 @@ def test_extract_audio_from_video_and_cleanup(tmp_path, monkeypatch):
             return self
 
         def run(self, overwrite_output=False, quiet=None):  # noqa: D401
-            # simulate ffmpeg writing the output file
-            os.makedirs(os.path.dirname(calls["output"]["out_path"]), exist_ok=True)
-            with open(calls["output"]["out_path"], "wb") as f:
-                f.write(b"audio")
+            calls["overwrite_output"] = overwrite_output
 
     dummy_ffmpeg = types.SimpleNamespace(
         input=lambda path, **kwargs: DummyStream(path)
@@ -71,19 +59,16 @@ def test_extract_audio_from_video_and_cleanup(tmp_path, monkeypatch):
     out = extractor.extract_audio_from_video(str(video_path))
 
     assert out.endswith(".wav")
-    assert os.path.exists(out)
+    assert out == calls["output"]["out_path"]
     assert calls["output"]["acodec"] == "pcm_s16le"
     assert calls["output"]["ar"] == extractor.sample_rate
     assert calls["output"]["ac"] == 1
+    assert calls["overwrite_output"] is True
 
 
-def test_convert_audio_format_uses_target_settings(tmp_path, monkeypatch):
-    _patch_config_for_tmp(tmp_path, monkeypatch)
-
-    from app.services import audio_extractor as ae_mod
-
+def test_convert_audio_format_uses_target_settings(tmp_config, monkeypatch):
     # prepare a fake input audio file
-    src = tmp_path / "src.wav"
+    src = tmp_config / "src.wav"
     src.write_bytes(b"data")
 
     calls = {}
@@ -113,7 +98,7 @@ def test_convert_audio_format_uses_target_settings(tmp_path, monkeypatch):
     monkeypatch.setattr(ae_mod, "ffmpeg", dummy_ffmpeg)
 
     extractor = AudioExtractor()
-    out_path = str(tmp_path / "out.wav")
+    out_path = str(tmp_config / "out.wav")
 
     result = extractor.convert_audio_format(str(src), out_path, target_format="wav", sample_rate=8000)
     assert result == out_path
@@ -146,57 +131,138 @@ def test_probe_duration_seconds_uses_format_and_streams():
     assert d3 == 0.0
 
 
-def test_split_audio_by_duration_and_get_audio_info(tmp_path, monkeypatch):
-    _patch_config_for_tmp(tmp_path, monkeypatch)
-
-    from app.services import audio_extractor as ae_mod
-
-    audio_path = tmp_path / "audio.wav"
-    audio_path.write_bytes(b"audio-data")
+@pytest.mark.parametrize("temp_name", ["temp", "te%mp"])
+def test_split_audio_by_duration_and_get_audio_info(tmp_config, monkeypatch, temp_name):
+    audio_path = tmp_config / "audio.wav"
+    audio_path.write_bytes(_FAKE_AUDIO_BYTES)
 
     def fake_probe(path):  # noqa: D401
         assert path == str(audio_path)
         return {
-            "format": {"duration": "10", "bit_rate": "128000", "size": str(len(b"audio-data"))},
+            "format": {"duration": "10", "bit_rate": "128000", "size": str(len(_FAKE_AUDIO_BYTES))},
             "streams": [
                 {"codec_type": "audio", "sample_rate": "16000", "channels": 1, "codec_name": "pcm"}
             ],
         }
 
+    calls = {"run_count": 0}
+
     class DummySegStream:
-        def __init__(self, path, ss=None, t=None):  # noqa: D401
+        def __init__(self, path):  # noqa: D401
             self.path = path
-            self.ss = ss
-            self.t = t
 
-        def output(self, out_path, acodec=None, ar=None, ac=None):  # noqa: D401
-            # simulate writing out the segment
-            os.makedirs(os.path.dirname(out_path), exist_ok=True)
-            with open(out_path, "wb") as f:
-                f.write(b"segment")
+        def output(self, out_pattern, **kwargs):  # noqa: D401
+            calls["output"] = {"out_pattern": out_pattern, **kwargs}
             return self
 
         def run(self, quiet=None, overwrite_output=None):  # noqa: D401
-            return None
+            # simulate the segment muxer writing every segment in one run
+            calls["run_count"] += 1
+            # the pattern is expanded printf-style, like ffmpeg does
+            out_pattern = calls["output"]["out_pattern"]
+            for i in range(3):
+                out_path = out_pattern % i
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                with open(out_path, "wb") as f:
+                    f.write(b"segment")
 
-    def fake_input(path, ss=None, t=None):  # noqa: D401
-        return DummySegStream(path, ss=ss, t=t)
+    def fake_input(path):  # noqa: D401
+        return DummySegStream(path)
 
     dummy_ffmpeg = types.SimpleNamespace(probe=fake_probe, input=fake_input)
 
     monkeypatch.setattr(ae_mod, "ffmpeg", dummy_ffmpeg)
 
     extractor = AudioExtractor()
+    # a literal % in temp_dir must survive the printf-style segment pattern
+    extractor.temp_dir = str(tmp_config / temp_name)
     segments = extractor.split_audio_by_duration(str(audio_path), segment_duration=4)
 
     # duration=10, segment_duration=4 -> 3 segments
     assert len(segments) == 3
     assert segments[0]["start_time"] == 0
     assert segments[0]["end_time"] == 4
+    assert segments[2]["end_time"] == 10
+    # all segments come from a single ffmpeg segment-muxer invocation
+    assert calls["run_count"] == 1
+    assert calls["output"]["f"] == "segment"
+    assert calls["output"]["segment_time"] == 4
 
     info = extractor.get_audio_info(str(audio_path))
     assert info["duration"] == 10.0
     assert info["sample_rate"] == 16000
     assert info["channels"] == 1
     assert info["codec"] == "pcm"
-    assert info["size"] == len(b"audio-data")
+    assert info["size"] == len(_FAKE_AUDIO_BYTES)
+
+
+def test_get_audio_info_reads_pcm_wav_header_without_ffprobe(tmp_config, monkeypatch):
+    audio_path = tmp_config / "audio.wav"
+    audio_path.write_bytes(_WAV_1S_16K_MONO)
+
+    def fail_probe(path):  # noqa: D401
+        raise AssertionError("ffmpeg.probe should not be needed for PCM WAV")
+
+    monkeypatch.setattr(ae_mod, "ffmpeg", types.SimpleNamespace(probe=fail_probe))
+
+    reads = []
+    real_open = open
+
+    class CountingFile:
+        def __init__(self, f):  # noqa: D401
+            self._f = f
+
+        def __enter__(self):  # noqa: D401
+            return self
+
+        def __exit__(self, *exc):  # noqa: D401
+            self._f.close()
+
+        def read(self, n=-1):  # noqa: D401
+            data = self._f.read(n)
+            reads.append(len(data))
+            return data
+
+        def seek(self, *args):  # noqa: D401
+            return self._f.seek(*args)
+
+        def tell(self):  # noqa: D401
+            return self._f.tell()
+
+    monkeypatch.setattr(
+        ae_mod, "open", lambda *a, **kw: CountingFile(real_open(*a, **kw)), raising=False
+    )
+
+    extractor = AudioExtractor()
+    info = extractor.get_audio_info(str(audio_path))
+
+    assert info["duration"] == 1.0
+    assert info["sample_rate"] == 16000
+    assert info["channels"] == 1
+    assert info["codec"] == "pcm_s16le"
+    assert info["bitrate"] == 256000
+    assert info["size"] == len(_WAV_1S_16K_MONO)
+    # only the 44 header bytes are read, never the sample data
+    assert sum(reads) == 44
+
+
+def test_get_audio_info_skips_list_chunk_before_data(tmp_config, monkeypatch):
+    # ffmpeg's WAV muxer writes a LIST/INFO chunk (encoder tag) between fmt and data;
+    # an odd-sized chunk also checks the even-byte padding.
+    info_payload = b"INFOISFT\x0d\x00\x00\x00Lavf60.3.100\x00"
+    list_chunk = struct.pack("<4sI", b"LIST", len(info_payload)) + info_payload + b"\x00"
+    assert len(info_payload) % 2 == 1
+    header = _WAV_1S_16K_MONO[:36]
+    audio_path = tmp_config / "ffmpeg.wav"
+    audio_path.write_bytes(header + list_chunk + _WAV_1S_16K_MONO[36:])
+
+    def fail_probe(path):  # noqa: D401
+        raise AssertionError("ffmpeg.probe should not be needed for PCM WAV")
+
+    monkeypatch.setattr(ae_mod, "ffmpeg", types.SimpleNamespace(probe=fail_probe))
+
+    info = AudioExtractor().get_audio_info(str(audio_path))
+
+    assert info["duration"] == 1.0
+    assert info["sample_rate"] == 16000
+    assert info["codec"] == "pcm_s16le"
@@ -1,97 +1,109 @@
-﻿from flask import Flask, jsonify
+﻿import pytest
+from flask import jsonify
 
 import app.utils.auth as auth
 import app.config.settings as settings
 from app.config.settings import Config
 
 
-def _make_app_with_protected_route():
-    app = Flask(__name__)
+@pytest.fixture(scope="module")
+def auth_client(bare_app):
+    app = bare_app()
 
     @app.route("/protected")
     @auth.admin_protected
     def protected():  # pragma: no cover - inner logic tested via wrapper
         return jsonify({"ok": True})
 
-    # Reset module-level warning flag between tests
-    auth._warned_no_admin = False
-    return app
-
-
-def test_admin_protected_allows_without_token_in_dev(monkeypatch):
-    """In development with no ADMIN_TOKEN, route should be open."""
-
-    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
-    monkeypatch.setenv("FLASK_ENV", "development")
-    monkeypatch.delenv("ENFORCE_ADMIN_TOKEN", raising=False)
-
-    app = _make_app_with_protected_route()
-    client = app.test_client()
-
-    resp = client.get("/protected")
-    assert resp.status_code == 200
-    assert resp.get_json()["ok"] is True
-
-
-def test_admin_protected_requires_header_when_token_set(monkeypatch):
-    """When ADMIN_TOKEN is set, valid X-Admin-Token is required."""
-
-    monkeypatch.setenv("ADMIN_TOKEN", "secret123")
-    monkeypatch.setenv("FLASK_ENV", "production")
-
-    app = _make_app_with_protected_route()
-    client = app.test_client()
-
-    # Missing header -> 403
-    resp = client.get("/protected")
-    assert resp.status_code == 403
-
-    # Correct header -> 200
-    resp2 = client.get("/protected", headers={"X-Admin-Token": "secret123"})
-    assert resp2.status_code == 200
-    assert resp2.get_json()["ok"] is True
-
+    return app.test_client()
 
-def test_admin_protected_enforced_in_production_without_token(monkeypatch):
-    """Production + ENFORCE_ADMIN_TOKEN=true + no token should be rejected."""
 
-    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
-    monkeypatch.setenv("FLASK_ENV", "production")
-    monkeypatch.setenv("ENFORCE_ADMIN_TOKEN", "true")
-
-    app = _make_app_with_protected_route()
-    client = app.test_client()
-
-    resp = client.get("/protected")
-    assert resp.status_code == 403
-
-
-def test_admin_protected_enforced_via_config_security_flag(monkeypatch):
-    """Production + security.enforce_admin_token=true should be rejected without token."""
-
-    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
-    monkeypatch.setenv("FLASK_ENV", "production")
-    monkeypatch.delenv("ENFORCE_ADMIN_TOKEN", raising=False)
-
-    def fake_load_config():
-        return {"security": {"enforce_admin_token": True}}
-
-    # Ensure Config.load_config reads our in-memory security config
-    monkeypatch.setattr(Config, "load_config", staticmethod(fake_load_config))
+@pytest.fixture(autouse=True)
+def _reset_auth_state():
+    # Reset module-level warning flag and config cache between tests
+    auth._warned_no_admin = False
+    Config._config_cache = None
+
+
+_ADMIN_ENV_KEYS = ("ADMIN_TOKEN", "FLASK_ENV", "ENFORCE_ADMIN_TOKEN")
+_NO_ADMIN_WARNING = "生产环境未配置 ADMIN_TOKEN"
+
+
+@pytest.mark.parametrize(
+    "env_map,cfg,headers,expected_status",
+    [
+        # In development with no ADMIN_TOKEN, route should be open
+        ({"FLASK_ENV": "development"}, None, None, 200),
+        # When ADMIN_TOKEN is set, valid X-Admin-Token is required
+        ({"ADMIN_TOKEN": "secret123", "FLASK_ENV": "production"}, None, None, 403),
+        (
+            {"ADMIN_TOKEN": "secret123", "FLASK_ENV": "production"},
+            None,
+            {"X-Admin-Token": "secret123"},
+            200,
+        ),
+        (
+            {"ADMIN_TOKEN": "secret123", "FLASK_ENV": "production"},
+            None,
+            {"X-Admin-Token": "wrong"},
+            403,
+        ),
+        # Production + ENFORCE_ADMIN_TOKEN=true + no token should be rejected
+        ({"FLASK_ENV": "production", "ENFORCE_ADMIN_TOKEN": "true"}, None, None, 403),
+        # Production + security.enforce_admin_token=true should be rejected without token
+        (
+            {"FLASK_ENV": "production"},
+            {"security": {"enforce_admin_token": True}},
+            None,
+            403,
+        ),
+    ],
+    ids=[
+        "dev-no-token",
+        "token-missing-header",
+        "token-valid-header",
+        "token-wrong-header",
+        "enforced-by-env",
+        "enforced-by-config",
+    ],
+)
+def test_admin_protected(
+    auth_client, env, monkeypatch, env_map, cfg, headers, expected_status
+):
+    env(env_map, clear=_ADMIN_ENV_KEYS)
+    if cfg is not None:
+        # Ensure Config.load_config reads our in-memory security config
+        monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    resp = auth_client.get("/protected", headers=headers)
+    assert resp.status_code == expected_status
+    if expected_status == 200:
+        assert resp.get_json()["ok"] is True
+
+
+def test_admin_protected_checks_token_on_every_request_in_one_app_context(env, bare_app):
+    env({"ADMIN_TOKEN": "secret123", "FLASK_ENV": "production"}, clear=_ADMIN_ENV_KEYS)
+    app = bare_app()
+
+    @app.route("/p")
+    @auth.admin_protected
+    def p():
+        return jsonify({"ok": True})
 
-    app = _make_app_with_protected_route()
     client = app.test_client()
-
-    resp = client.get("/protected")
-    assert resp.status_code == 403
+    # A shared app context must not carry a successful check over to the next request
+    with app.app_context():
+        assert client.get("/p", headers={"X-Admin-Token": "secret123"}).status_code == 200
+        assert client.get("/p").status_code == 403
+        assert client.get("/p", headers={"X-Admin-Token": "wrong"}).status_code == 403
 
 
-def test_admin_protected_logs_warning_once_in_production_without_enforcement(monkeypatch, caplog):
+def test_admin_protected_logs_warning_once_in_production_without_enforcement(
+    auth_client, env, monkeypatch, caplog
+):
     """Production + no token + no enforcement should log once then allow access."""
 
-    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
-    monkeypatch.setenv("FLASK_ENV", "production")
-    monkeypatch.delenv("ENFORCE_ADMIN_TOKEN", raising=False)
+    env({"FLASK_ENV": "production"}, clear=_ADMIN_ENV_KEYS)
 
     # Config without enforce_admin_token
     def fake_load_config():
@@ -99,21 +111,13 @@ def test_admin_protected_logs_warning_once_in_production_without_enforcement(mon
 
     monkeypatch.setattr(Config, "load_config", staticmethod(fake_load_config))
 
-    app = _make_app_with_protected_route()
-    client = app.test_client()
-
     # First request should log a warning and allow access
-    with caplog.at_level("WARNING"):
-        resp1 = client.get("/protected")
-        resp2 = client.get("/protected")
+    with caplog.at_level("WARNING", logger="app.utils.auth"):
+        resp1 = auth_client.get("/protected")
+        resp2 = auth_client.get("/protected")
 
     assert resp1.status_code == 200
     assert resp2.status_code == 200
 
-    warn_messages = [
-        r.getMessage()
-        for r in caplog.records
-        if "生产环境未配置 ADMIN_TOKEN" in r.getMessage()
-    ]
     # Only one warning should be emitted despite two requests
-    assert len(warn_messages) == 1
+    assert sum(1 for r in caplog.records if _NO_ADMIN_WARNING in r.message) == 1
@@ -0,0 +1,57 @@
+"""RSA-keygen heavy certificate tests, kept in their own file for xdist loadfile."""
+
+import pytest
+
+from app.utils.certificate_manager import CertificateManager
+
+
+pytestmark = pytest.mark.usefixtures("shared_rsa_keygen")
+
+
+@pytest.mark.slow
+def test_generate_self_signed_cert_and_get_info(cert_config):
+    cfg = cert_config()
+    cm = CertificateManager(cfg)
+
+    assert cm.certificates_exist() is False
+
+    ok, msg = cm.generate_self_signed_cert()
+    assert ok is True
+    assert cm.certificates_exist() is True
+
+    ok, info = cm.get_certificate_info()
+    assert ok is True
+    assert isinstance(info, dict)
+    assert info["subject"]
+    assert info["issuer"]
+    assert info["not_valid_before"]
+    assert info["not_valid_after"]
+
+    domains = info.get("domains", [])
+    # SAN should at least contain our domain and localhost
+    assert any("example.com" in d for d in domains)
+    assert any("localhost" in d for d in domains)
+
+
+@pytest.mark.slow
+def test_delete_certificates_and_ensure_certificates(cert_config):
+    cfg = cert_config()
+    cm = CertificateManager(cfg)
+    cm.generate_self_signed_cert()
+    assert cm.certificates_exist() is True
+
+    ok, msg = cm.delete_certificates()
+    assert ok is True
+    assert cm.certificates_exist() is False
+
+    # auto_generate=True should recreate certificates
+    cm_auto = CertificateManager(cert_config(auto_generate=True))
+    assert cm_auto.ensure_certificates() is True
+    assert cm_auto.certificates_exist() is True
+
+    # auto_generate=False should not create certificates when missing
+    cfg_no_auto = cert_config(auto_generate=False)
+    cm_no_auto = CertificateManager(cfg_no_auto)
+    cm_no_auto.delete_certificates()
+    assert cm_no_auto.ensure_certificates() is False
+    assert cm_no_auto.certificates_exist() is False
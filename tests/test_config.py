@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 import app.config.settings as settings
 from app.config.settings import Config, _resolve_secret_key
@@ -27,43 +28,40 @@ def test_load_config_uses_project_root(tmp_path, monkeypatch):
     assert cfg["web"]["port"] == 12345
 
 
-def test_get_api_config_reads_from_loaded_config(tmp_path, monkeypatch):
+def test_get_api_config_reads_from_loaded_config(monkeypatch):
     """Config.get_api_config should return the service section from config."""
 
-    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
+    # YAML parsing is covered by test_load_config_uses_project_root; hand the
+    # already-parsed dict to load_config here
+    cfg = {"apis": {"siliconflow": {"api_key": "sf-key"}, "openai": {"api_key": "oa-key"}}}
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
     Config._config_cache = None
 
-    (tmp_path / "config").mkdir()
-    (tmp_path / "config" / "config.yaml").write_text(
-        "apis:\n"
-        "  siliconflow:\n"
-        "    api_key: 'sf-key'\n"
-        "  openai:\n"
-        "    api_key: 'oa-key'\n",
-        encoding="utf-8",
-    )
-
     cfg_sf = Config.get_api_config("siliconflow")
     cfg_oa = Config.get_api_config("openai")
     assert cfg_sf["api_key"] == "sf-key"
     assert cfg_oa["api_key"] == "oa-key"
 
 
-def test_get_https_config_env_override(monkeypatch):
+def test_get_https_config_env_override(env):
     """When HTTPS_ENABLED is set, HTTPS config should be driven by env vars."""
 
     Config._config_cache = None
 
-    monkeypatch.setenv("HTTPS_ENABLED", "true")
-    monkeypatch.setenv("HTTPS_PORT", "8443")
-    monkeypatch.setenv("HTTPS_HOST", "127.0.0.1")
-    monkeypatch.setenv("CERT_AUTO_GENERATE", "false")
-    monkeypatch.setenv("CERT_DOMAIN", "example.com")
-    monkeypatch.setenv("CERT_COUNTRY", "US")
-    monkeypatch.setenv("CERT_STATE", "CA")
-    monkeypatch.setenv("CERT_ORGANIZATION", "Example Org")
-    monkeypatch.setenv("CERT_FILE", "config/custom_cert.pem")
-    monkeypatch.setenv("KEY_FILE", "config/custom_key.pem")
+    env(
+        {
+            "HTTPS_ENABLED": "true",
+            "HTTPS_PORT": "8443",
+            "HTTPS_HOST": "127.0.0.1",
+            "CERT_AUTO_GENERATE": "false",
+            "CERT_DOMAIN": "example.com",
+            "CERT_COUNTRY": "US",
+            "CERT_STATE": "CA",
+            "CERT_ORGANIZATION": "Example Org",
+            "CERT_FILE": "config/custom_cert.pem",
+            "KEY_FILE": "config/custom_key.pem",
+        }
+    )
 
     https_cfg = Config.get_https_config()
     assert https_cfg["enabled"] is True
@@ -80,10 +78,15 @@ def test_get_https_config_env_override(monkeypatch):
     assert https_cfg["key_file"].endswith(os.path.join("config", "custom_key.pem"))
 
 
-def test_resolve_secret_key_prefers_env(tmp_path, monkeypatch):
+# Fake project root used by the pyfakefs-backed secret key tests
+_FAKE_ROOT = os.path.abspath("/videowhisper-fake-root")
+
+
+def test_resolve_secret_key_prefers_env(fs, monkeypatch):
     """_resolve_secret_key must prefer SECRET_KEY env over files."""
 
-    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
+    fs.create_dir(_FAKE_ROOT)
+    monkeypatch.setattr(settings, "_PROJECT_ROOT", _FAKE_ROOT, raising=False)
     Config._config_cache = None
 
     monkeypatch.setenv("SECRET_KEY", "env-secret-key")
@@ -91,16 +94,17 @@ def test_resolve_secret_key_prefers_env(tmp_path, monkeypatch):
     assert key == "env-secret-key"
 
 
-def test_resolve_secret_key_persists_to_file(tmp_path, monkeypatch):
+def test_resolve_secret_key_persists_to_file(fs, monkeypatch):
     """Without SECRET_KEY env, it should generate and persist to config/.secret_key."""
 
-    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
+    fs.create_dir(_FAKE_ROOT)
+    monkeypatch.setattr(settings, "_PROJECT_ROOT", _FAKE_ROOT, raising=False)
     Config._config_cache = None
 
     monkeypatch.delenv("SECRET_KEY", raising=False)
 
     key1 = _resolve_secret_key()
-    secret_file = tmp_path / "config" / ".secret_key"
+    secret_file = Path(_FAKE_ROOT) / "config" / ".secret_key"
     assert secret_file.exists()
     saved = secret_file.read_text(encoding="utf-8").strip()
     assert saved == key1
@@ -108,4 +112,3 @@ def test_resolve_secret_key_persists_to_file(tmp_path, monkeypatch):
     monkeypatch.delenv("SECRET_KEY", raising=False)
     key2 = _resolve_secret_key()
     assert key2 == key1
-
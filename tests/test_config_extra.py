@@ -4,20 +4,36 @@ import app.config.settings as settings
 from app.config.settings import Config
 
 
-def test_project_root_and_resolve_path(tmp_path, monkeypatch):
+_HTTPS_FILE_CONFIG = {
+    "https": {
+        "enabled": True,
+        "port": 1234,
+        "host": "127.0.0.1",
+        "auto_generate": False,
+        "domain": "example.com",
+        "country": "US",
+        "state": "CA",
+        "organization": "Example Org",
+        "cert_file": "config/custom_cert.pem",
+        "key_file": "config/custom_key.pem",
+    }
+}
+
+
+def test_project_root_and_resolve_path(shared_root, monkeypatch):
     # Point project root to a temporary location
-    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(shared_root), raising=False)
 
     # project_root should reflect patched value
-    assert Config.project_root() == str(tmp_path)
+    assert Config.project_root() == str(shared_root)
 
     # relative paths are resolved against project root
     rel = os.path.join("config", "config.yaml")
     resolved = Config.resolve_path(rel)
-    assert resolved == os.path.abspath(os.path.join(str(tmp_path), rel))
+    assert resolved == os.path.abspath(os.path.join(str(shared_root), rel))
 
     # absolute paths are returned as-is
-    abs_path = os.path.join(str(tmp_path), "abs", "file.txt")
+    abs_path = os.path.join(str(shared_root), "abs", "file.txt")
     assert Config.resolve_path(abs_path) == abs_path
 
     # empty path is returned unchanged
@@ -37,31 +53,15 @@ def test_get_config_returns_empty_dict_when_load_config_fails(monkeypatch):
     assert cfg == {}
 
 
-def test_get_https_config_falls_back_to_config_file(tmp_path, monkeypatch):
+def test_get_https_config_falls_back_to_config_file(shared_root, monkeypatch):
     # ensure env HTTPS_ENABLED does not short-circuit to env-only config
     monkeypatch.delenv("HTTPS_ENABLED", raising=False)
 
-    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "_PROJECT_ROOT", str(shared_root), raising=False)
+    # Hand load_config an already-parsed config instead of writing/parsing YAML
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: _HTTPS_FILE_CONFIG))
     Config._config_cache = None
 
-    config_dir = tmp_path / "config"
-    config_dir.mkdir()
-    cfg_path = config_dir / "config.yaml"
-    cfg_path.write_text(
-        "https:\n"
-        "  enabled: true\n"
-        "  port: 1234\n"
-        "  host: '127.0.0.1'\n"
-        "  auto_generate: false\n"
-        "  domain: 'example.com'\n"
-        "  country: 'US'\n"
-        "  state: 'CA'\n"
-        "  organization: 'Example Org'\n"
-        "  cert_file: 'config/custom_cert.pem'\n"
-        "  key_file: 'config/custom_key.pem'\n",
-        encoding="utf-8",
-    )
-
     https_cfg = Config.get_https_config()
     assert https_cfg["enabled"] is True
     assert https_cfg["port"] == 1234
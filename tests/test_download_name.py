@@ -1,4 +1,6 @@
-﻿from app.utils.download_name import build_filename
+﻿import re
+
+from app.utils.download_name import build_filename
 
 
 def test_build_filename_strips_extension_and_normalizes_title():
@@ -30,3 +32,8 @@ def test_build_filename_truncates_long_title():
     # implementation truncates title to at most 20 characters
     assert len(title_part) <= 20
     assert name.endswith(".txt")
+
+
+def test_build_filename_uses_precompiled_patterns():
+    assert isinstance(build_filename.__globals__["_TITLE_RE"], re.Pattern)
+    assert isinstance(build_filename.__globals__["_MEDIA_EXT_RE"], re.Pattern)
@@ -1,15 +1,29 @@
 ﻿import logging
 
-from flask import Flask, jsonify, g
+import pytest
+from flask import jsonify, g
+from werkzeug.test import EnvironBuilder
 
 import app as app_module
 from app import create_app
+import app.utils.log_safety as log_safety
 from app.utils.log_safety import mask_sensitive_data
 from app.utils.error_handler import api_error_handler, safe_json_response
 
 
-def _create_error_app():
-    app = Flask(__name__)
+_ERROR_ROUTES = (
+    "/err/value",
+    "/err/notfound",
+    "/err/key",
+    "/err/conn",
+    "/err/perm",
+    "/err/unhandled",
+)
+
+
+@pytest.fixture(scope="module")
+def error_client(bare_app):
+    app = bare_app()
 
     @app.route("/err/value")
     @api_error_handler
@@ -44,37 +58,54 @@ def _create_error_app():
     def err_unhandled():  # pragma: no cover
         raise RuntimeError("boom")
 
-    return app
+    return app.test_client()
 
 
-def test_api_error_handler_value_error():
-    app = _create_error_app()
-    client = app.test_client()
+@pytest.fixture(scope="module")
+def error_builders():
+    """One reusable GET environ builder per error route."""
 
-    resp = client.get("/err/value")
-    data = resp.get_json()
-    assert resp.status_code == 400
-    assert data["success"] is False
-    # exact message text is not critical, just ensure an error string is returned
-    assert isinstance(data["error"], str) and data["error"]
+    return {path: EnvironBuilder(path=path, method="GET") for path in _ERROR_ROUTES}
 
 
-def test_api_error_handler_file_not_found():
-    app = _create_error_app()
-    client = app.test_client()
+@pytest.fixture(scope="module")
+def json_error_client(bare_app):
+    app = bare_app()
+
+    @app.route("/err/json", methods=["POST"])
+    @api_error_handler
+    def err_json():  # pragma: no cover - behaviour tested via wrapper
+        raise RuntimeError("boom")
 
-    resp = client.get("/err/notfound")
+    return app.test_client()
+
+
+@pytest.mark.parametrize(
+    "route,status",
+    [
+        ("/err/value", 400),
+        ("/err/notfound", 404),
+        ("/err/conn", 503),
+        ("/err/perm", 403),
+        ("/err/unhandled", 500),
+    ],
+    ids=["value", "notfound", "conn", "perm", "unhandled"],
+)
+def test_api_error_handler_maps_exceptions_to_status(
+    error_client, error_builders, route, status
+):
+    resp = error_client.open(error_builders[route])
     data = resp.get_json()
-    assert resp.status_code == 404
-    # implementation uses a Chinese message; we only require a non-empty error string
+    assert resp.status_code == status
+    assert data["success"] is False
+    # exact (Chinese) message text is not critical, just ensure an error string is returned
     assert isinstance(data["error"], str) and data["error"]
 
 
-def test_api_error_handler_key_error_url_has_friendly_message():
-    app = _create_error_app()
-    client = app.test_client()
-
-    resp = client.get("/err/key")
+def test_api_error_handler_key_error_url_has_friendly_message(
+    error_client, error_builders
+):
+    resp = error_client.open(error_builders["/err/key"])
     data = resp.get_json()
     assert resp.status_code == 400
     # For missing url, a more friendly message should be returned instead of raw "url" key
@@ -82,50 +113,19 @@ def test_api_error_handler_key_error_url_has_friendly_message():
     assert "url" not in data["message"]
 
 
-def test_api_error_handler_connection_error():
-    app = _create_error_app()
-    client = app.test_client()
-
-    resp = client.get("/err/conn")
-    data = resp.get_json()
-    assert resp.status_code == 503
-    assert isinstance(data["error"], str) and data["error"]
-
-
-def test_api_error_handler_permission_error():
-    app = _create_error_app()
-    client = app.test_client()
-
-    resp = client.get("/err/perm")
-    data = resp.get_json()
-    assert resp.status_code == 403
-    assert isinstance(data["error"], str) and data["error"]
-
-
-def test_api_error_handler_unhandled_exception():
-    app = _create_error_app()
-    client = app.test_client()
-
-    resp = client.get("/err/unhandled")
-    data = resp.get_json()
-    assert resp.status_code == 500
-    assert data["success"] is False
+def test_api_error_handler_unhandled_exception_reports_type(
+    error_client, error_builders
+):
+    data = error_client.open(error_builders["/err/unhandled"]).get_json()
     # error_type should reflect the original exception type
     assert data["error_type"] == "RuntimeError"
 
 
-def test_api_error_handler_masks_sensitive_json_fields_in_logs(caplog):
+def test_api_error_handler_masks_sensitive_json_fields_in_logs(
+    json_error_client, caplog
+):
     """Generic error with JSON body should mask sensitive fields in logs."""
 
-    app = Flask(__name__)
-
-    @app.route("/err/json", methods=["POST"])
-    @api_error_handler
-    def err_json():  # pragma: no cover - behaviour tested via wrapper
-        raise RuntimeError("boom")
-
-    client = app.test_client()
-
     payload = {
         "api_key": "secret-key",
         "token": "very-secret",
@@ -135,7 +135,7 @@ def test_api_error_handler_masks_sensitive_json_fields_in_logs(caplog):
     }
 
     with caplog.at_level(logging.ERROR):
-        resp = client.post("/err/json", json=payload)
+        resp = json_error_client.post("/err/json", json=payload)
 
     data = resp.get_json()
     assert resp.status_code == 500
@@ -151,6 +151,21 @@ def test_api_error_handler_masks_sensitive_json_fields_in_logs(caplog):
     assert "***" in log_text
 
 
+def test_api_error_handler_masking_does_not_compile_regex_per_request(
+    json_error_client, monkeypatch
+):
+    # the key pattern is compiled at import; the request path must not touch re
+    monkeypatch.setattr(log_safety, "re", None)
+
+    resp = json_error_client.post(
+        "/err/json", json={"Authorization": "Bearer x", "normal": "value"}
+    )
+
+    assert resp.status_code == 500
+    assert log_safety.is_sensitive_key("X-Api_Key") is True
+    assert log_safety.is_sensitive_key("normal") is False
+
+
 def test_mask_sensitive_data_masks_nested_cookie_payloads():
     payload = {
         "normal": "value",
@@ -219,8 +234,8 @@ def test_create_app_masks_sensitive_json_fields_in_global_error_logs(
     assert "***" in log_text
 
 
-def test_safe_json_response_basic():
-    app = Flask(__name__)
+def test_safe_json_response_basic(bare_app):
+    app = bare_app()
 
     with app.app_context():
         resp, status = safe_json_response(success=True, data={"a": 1}, message="ok")
@@ -231,8 +246,8 @@ def test_safe_json_response_basic():
         assert data["message"] == "ok"
 
 
-def test_safe_json_response_includes_request_id_meta():
-    app = Flask(__name__)
+def test_safe_json_response_includes_request_id_meta(bare_app):
+    app = bare_app()
 
     with app.test_request_context("/"):
         g.request_id = "req-123"
@@ -1,10 +1,16 @@
 import os
 import uuid
 
+import pytest
+
 from app.services.file_manager import FileManager
 from app.config.settings import Config
 
 
+# Deterministic v4-shaped task ids; no urandom draw per test run
+_UUIDS = [str(uuid.UUID(int=i, version=4)) for i in range(1, 17)]
+
+
 def _make_config(temp_dir: str, output_dir: str):
     return {
         "system": {
@@ -14,18 +20,26 @@ def _make_config(temp_dir: str, output_dir: str):
     }
 
 
-def test_register_task_and_history_truncation(tmp_path, monkeypatch):
+@pytest.fixture
+def fm_env(tmp_path, monkeypatch):
+    """FileManager wired to fresh temp/output dirs under tmp_path."""
+
     temp_dir = tmp_path / "temp"
     output_dir = tmp_path / "output"
     temp_dir.mkdir()
     output_dir.mkdir()
 
-    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: _make_config(str(temp_dir), str(output_dir))))
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: cfg))
+
+    return FileManager(), temp_dir, output_dir
 
-    fm = FileManager()
+
+def test_register_task_and_history_truncation(fm_env):
+    fm, temp_dir, output_dir = fm_env
 
     # 注册多个任务，超过 max_temp_tasks=3，看是否被截断
-    task_ids = [str(uuid.uuid4()) for _ in range(5)]
+    task_ids = _UUIDS[:5]
     for tid in task_ids:
         fake_file = temp_dir / f"{tid}.tmp"
         fake_file.write_text("x", encoding="utf-8")
@@ -38,15 +52,8 @@ def test_register_task_and_history_truncation(tmp_path, monkeypatch):
     assert set(task_ids[-3:]).issubset(remaining_ids)
 
 
-def test_cleanup_task_files_removes_files_and_history(tmp_path, monkeypatch):
-    temp_dir = tmp_path / "temp"
-    output_dir = tmp_path / "output"
-    temp_dir.mkdir()
-    output_dir.mkdir()
-
-    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: _make_config(str(temp_dir), str(output_dir))))
-
-    fm = FileManager()
+def test_cleanup_task_files_removes_files_and_history(fm_env):
+    fm, temp_dir, output_dir = fm_env
     task_id = str(uuid.uuid4())
 
     # 创建任务相关文件
@@ -72,15 +79,24 @@ def test_cleanup_task_files_removes_files_and_history(tmp_path, monkeypatch):
     assert all(h.get("task_id") != task_id for h in history_after)
 
 
-def test_cleanup_task_files_does_not_remove_temp_dir_for_invalid_uuid(tmp_path, monkeypatch):
-    temp_dir = tmp_path / "temp"
-    output_dir = tmp_path / "output"
-    temp_dir.mkdir()
-    output_dir.mkdir()
+def test_cleanup_task_files_removes_loose_temp_file(fm_env):
+    fm, temp_dir, output_dir = fm_env
+    task_id = str(uuid.uuid4())
+
+    # 直接位于 temp 根目录的文件（如提取出的音频），不注册任务目录
+    audio = temp_dir / "video.wav"
+    audio.write_bytes(b"audio")
+    fm.register_task(task_id, [str(audio)])
+
+    fm.cleanup_task_files(task_id)
 
-    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: _make_config(str(temp_dir), str(output_dir))))
+    assert not audio.exists()
+    assert temp_dir.exists()
+    assert all(h.get("task_id") != task_id for h in fm.get_task_history())
 
-    fm = FileManager()
+
+def test_cleanup_task_files_does_not_remove_temp_dir_for_invalid_uuid(fm_env):
+    fm, temp_dir, output_dir = fm_env
     task_id = "not-a-uuid"
 
     task_temp_dir = temp_dir / task_id
@@ -98,15 +114,8 @@ def test_cleanup_task_files_does_not_remove_temp_dir_for_invalid_uuid(tmp_path,
     assert task_temp_dir.exists()
 
 
-def test_delete_output_task_dir_valid_and_invalid_ids(tmp_path, monkeypatch):
-    temp_dir = tmp_path / "temp"
-    output_dir = tmp_path / "output"
-    temp_dir.mkdir()
-    output_dir.mkdir()
-
-    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: _make_config(str(temp_dir), str(output_dir))))
-
-    fm = FileManager()
+def test_delete_output_task_dir_valid_and_invalid_ids(fm_env):
+    fm, temp_dir, output_dir = fm_env
 
     # 有效 UUID 对应的目录应被删除
     valid_id = str(uuid.uuid4())
@@ -121,15 +130,8 @@ def test_delete_output_task_dir_valid_and_invalid_ids(tmp_path, monkeypatch):
     assert fm.delete_output_task_dir("not-a-uuid") is False
 
 
-def test_cleanup_task_partial_dir_removes_only_partial_subdir(tmp_path, monkeypatch):
-    temp_dir = tmp_path / "temp"
-    output_dir = tmp_path / "output"
-    temp_dir.mkdir()
-    output_dir.mkdir()
-
-    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: _make_config(str(temp_dir), str(output_dir))))
-
-    fm = FileManager()
+def test_cleanup_task_partial_dir_removes_only_partial_subdir(fm_env):
+    fm, temp_dir, output_dir = fm_env
     task_id = str(uuid.uuid4())
     task_dir = output_dir / task_id
     partial_dir = task_dir / ".partial"
@@ -144,15 +146,8 @@ def test_cleanup_task_partial_dir_removes_only_partial_subdir(tmp_path, monkeypa
     assert final_file.exists()
 
 
-def test_cleanup_stale_partial_dirs_skips_active_tasks(tmp_path, monkeypatch):
-    temp_dir = tmp_path / "temp"
-    output_dir = tmp_path / "output"
-    temp_dir.mkdir()
-    output_dir.mkdir()
-
-    monkeypatch.setattr(Config, "get_config", staticmethod(lambda: _make_config(str(temp_dir), str(output_dir))))
-
-    fm = FileManager()
+def test_cleanup_stale_partial_dirs_skips_active_tasks(fm_env):
+    fm, temp_dir, output_dir = fm_env
     stale_task_id = str(uuid.uuid4())
     active_task_id = str(uuid.uuid4())
 
@@ -7,6 +7,10 @@ from app.services.file_uploader import FileUploader
 from app.config.settings import Config
 
 
+# Upload payload shared across tests; one upload_chunk_size (1 MB) read covers it
+_PAYLOAD = b"hello world" * 100
+
+
 def _make_minimal_config(temp_dir: str):
     return {
         "system": {
@@ -21,11 +25,18 @@ def _make_minimal_config(temp_dir: str):
     }
 
 
-def test_get_file_info_video_and_audio(tmp_path, monkeypatch):
-    cfg = _make_minimal_config(str(tmp_path / "temp"))
-    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+@pytest.fixture(scope="module")
+def uploader(tmp_path_factory):
+    """One FileUploader for the read-only tests; __init__ only parses config."""
 
-    fu = FileUploader()
+    cfg = _make_minimal_config(str(tmp_path_factory.mktemp("temp")))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, "load_config", staticmethod(lambda: cfg))
+        yield FileUploader()
+
+
+def test_get_file_info_video_and_audio(uploader):
+    fu = uploader
 
     info_video = fu._get_file_info("movie.mp4", 123)
     assert info_video["file_type"] == "video"
@@ -38,21 +49,34 @@ def test_get_file_info_video_and_audio(tmp_path, monkeypatch):
     assert info_audio["file_ext"] == "mp3"
 
 
-def test_get_file_info_unsupported_extension_raises(tmp_path, monkeypatch):
-    cfg = _make_minimal_config(str(tmp_path / "temp"))
-    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
-
-    fu = FileUploader()
-
+@pytest.mark.parametrize(
+    "filename, file_type, file_ext, need_extraction",
+    [
+        ("clip.mp4", "video", "mp4", True),
+        ("clip.MP4", "video", "mp4", True),
+        ("Song.Mp3", "audio", "mp3", False),
+        ("my.show.mP4", "video", "mp4", True),
+    ],
+)
+def test_get_file_info_classifies_extension_case_insensitively(
+    uploader, filename, file_type, file_ext, need_extraction
+):
+    info = uploader._get_file_info(filename, 42)
+
+    assert info["file_type"] == file_type
+    assert info["file_ext"] == file_ext
+    assert info["need_audio_extraction"] is need_extraction
+    assert info["file_size"] == 42
+
+
+@pytest.mark.parametrize("filename", ["file.xyz", "README", "archive.mp4.bak"])
+def test_get_file_info_unsupported_extension_raises(uploader, filename):
     with pytest.raises(ValueError):
-        fu._get_file_info("file.xyz", 10)
+        uploader._get_file_info(filename, 10)
 
 
-def test_validate_file_size_limit(tmp_path, monkeypatch):
-    cfg = _make_minimal_config(str(tmp_path / "temp"))
-    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
-
-    fu = FileUploader()
+def test_validate_file_size_limit(uploader):
+    fu = uploader
     max_bytes = fu.max_upload_size
 
     # Just under the limit should be allowed
@@ -73,10 +97,9 @@ def test_save_uploaded_file_writes_to_temp_dir(tmp_path, monkeypatch):
 
     fu = FileUploader()
 
-    data = b"hello world" * 100
-    file_obj = io.BytesIO(data)
+    file_obj = io.BytesIO(_PAYLOAD)
     original_filename = "movie.mp4"
-    file_size = len(data)
+    file_size = len(_PAYLOAD)
 
     result = fu.save_uploaded_file(file_obj, original_filename, file_size)
 
@@ -1,8 +1,26 @@
 ﻿import os
+import shutil
+
+import pytest
 
 from app.utils import helpers
 
 
+pytestmark = pytest.mark.thread_safe
+
+
+@pytest.fixture(scope="session")
+def helpers_tree(tmp_path_factory):
+    """Canonical keep/remove/subdir tree, built once and copied per test."""
+
+    root = tmp_path_factory.mktemp("tree")
+    (root / "keep.txt").write_bytes(b"k")
+    (root / "remove.txt").write_bytes(b"r")
+    (root / "subdir").mkdir()
+    (root / "subdir" / "inner.txt").write_bytes(b"x")
+    return root
+
+
 def test_ensure_directory_exists_idempotent(tmp_path):
     target = tmp_path / "subdir"
     # directory does not exist initially
@@ -16,16 +34,12 @@ def test_ensure_directory_exists_idempotent(tmp_path):
     assert target.is_dir()
 
 
-def test_clean_directory_removes_all_except_kept(tmp_path):
-    root = tmp_path
+def test_clean_directory_removes_all_except_kept(tmp_path, helpers_tree):
+    root = shutil.copytree(helpers_tree, tmp_path / "work")
     keep = root / "keep.txt"
     remove_file = root / "remove.txt"
     subdir = root / "subdir"
-
-    keep.write_text("k", encoding="utf-8")
-    remove_file.write_text("r", encoding="utf-8")
-    subdir.mkdir()
-    (subdir / "inner.txt").write_text("x", encoding="utf-8")
+    assert subdir.is_dir()
 
     helpers.clean_directory(str(root), keep_files=["keep.txt"])
 
@@ -5,37 +5,45 @@ import pytest
 from app.utils.path_safety import is_within, safe_join
 
 
-def test_is_within_true_for_child(tmp_path):
-    base = tmp_path
-    child = tmp_path / "sub" / "file.txt"
-    child.parent.mkdir(parents=True)
-    child.write_text("test", encoding="utf-8")
+pytestmark = pytest.mark.thread_safe
+
+
+@pytest.fixture(scope="session")
+def safety_tree(tmp_path_factory):
+    """Read-only base/outside layout shared by all path safety tests."""
+
+    root = tmp_path_factory.mktemp("safety")
+    (root / "base" / "sub").mkdir(parents=True)
+    (root / "base" / "dir").mkdir()
+    (root / "outside").mkdir()
+    (root / "base" / "sub" / "file.txt").write_bytes(b"test")
+    (root / "outside" / "file.txt").write_bytes(b"x")
+    return root
+
+
+def test_is_within_true_for_child(safety_tree):
+    base = safety_tree / "base"
+    child = base / "sub" / "file.txt"
 
     assert is_within(str(base), str(child)) is True
 
 
-def test_is_within_false_for_outside(tmp_path):
-    base = tmp_path / "base"
-    outside = tmp_path / "outside" / "file.txt"
-    base.mkdir()
-    outside.parent.mkdir()
-    outside.write_text("x", encoding="utf-8")
+def test_is_within_false_for_outside(safety_tree):
+    base = safety_tree / "base"
+    outside = safety_tree / "outside" / "file.txt"
 
     assert is_within(str(base), str(outside)) is False
 
 
-def test_safe_join_normal_path(tmp_path):
-    base = tmp_path
-    (base / "dir").mkdir()
+def test_safe_join_normal_path(safety_tree):
+    base = safety_tree / "base"
     joined = safe_join(str(base), "dir/test.txt")
     assert joined.startswith(str(base))
     assert joined.endswith(os.path.join("dir", "test.txt"))
 
 
-def test_safe_join_rejects_traversal(tmp_path):
-    base = tmp_path / "root"
-    base.mkdir()
+def test_safe_join_rejects_traversal(safety_tree):
+    base = safety_tree / "base"
 
     with pytest.raises(ValueError):
         safe_join(str(base), "../outside.txt")
-
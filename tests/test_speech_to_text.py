@@ -18,10 +18,10 @@ def test_transcribe_audio_requires_api_key(tmp_path, monkeypatch):
         st.transcribe_audio(str(audio))
 
 
-def test_transcribe_audio_file_not_found(tmp_path):
+def test_transcribe_audio_file_not_found(shared_root):
     st = SpeechToText(api_config={"api_key": "k", "base_url": "https://api.siliconflow.cn/v1", "model": "m"})
 
-    missing = tmp_path / "missing.wav"
+    missing = shared_root / "missing.wav"
     with pytest.raises(FileNotFoundError):
         st.transcribe_audio(str(missing))
 
@@ -80,11 +80,15 @@ def test_transcribe_audio_retries_on_empty_text(tmp_path, monkeypatch):
             return DummyResponse({"text": "  "})
         return DummyResponse({"text": "ok text"})
 
+    sleeps = []
     monkeypatch.setattr("app.services.speech_to_text.requests.post", fake_post)
+    # skip the real backoff between retries, but keep track of it
+    monkeypatch.setattr("app.services.speech_to_text.time.sleep", sleeps.append)
 
     result = st.transcribe_audio(str(audio))
     assert result["text"] == "ok text"
     assert calls["count"] == 3
+    assert sleeps == [2, 2]
 
 
 def test_format_transcript_and_get_full_text():
@@ -1,3 +1,4 @@
+import copy
 import types
 
 import pytest
@@ -12,8 +13,21 @@ def _build_tp_with_configs():
     return TextProcessor(openai_config=openai_cfg, gemini_config=gemini_cfg, siliconflow_config=sf_cfg)
 
 
-def test_ensure_openai_client_requires_api_key(monkeypatch):
-    tp = _build_tp_with_configs()
+@pytest.fixture(scope="module")
+def tp_template():
+    """Shared TextProcessor for tests that only read its state."""
+
+    return _build_tp_with_configs()
+
+
+@pytest.fixture
+def tp(tp_template):
+    """Private copy for tests that mutate configs or client attributes."""
+
+    return copy.deepcopy(tp_template)
+
+
+def test_ensure_openai_client_requires_api_key(tp):
     # Remove api_key to force error path
     tp.openai_config["api_key"] = ""
 
@@ -21,9 +35,7 @@ def test_ensure_openai_client_requires_api_key(monkeypatch):
         tp._ensure_openai_client()
 
 
-def test_ensure_openai_client_success(monkeypatch):
-    tp = _build_tp_with_configs()
-
+def test_ensure_openai_client_success(tp, monkeypatch):
     class DummyClient:
         def __init__(self, api_key, base_url=None):  # noqa: D401
             self.api_key = api_key
@@ -38,9 +50,7 @@ def test_ensure_openai_client_success(monkeypatch):
     assert client.base_url == "https://api.openai.example"
 
 
-def test_get_available_and_default_providers():
-    tp = _build_tp_with_configs()
-
+def test_get_available_and_default_providers(tp):
     # Pretend all three clients are available and runtime custom provider is enabled
     tp.siliconflow_client = object()
     tp.openai_client = object()
@@ -56,8 +66,9 @@ def test_get_available_and_default_providers():
     assert default == "siliconflow"
 
 
-def test_estimate_tokens_and_split_text():
-    tp = _build_tp_with_configs()
+@pytest.mark.thread_safe
+def test_estimate_tokens_and_split_text(tp_template):
+    tp = tp_template
     text = "abcdef"
     est = tp.estimate_tokens(text)
     assert est == int(len(text) * tp.TOKEN_ESTIMATE_RATIO)
@@ -74,9 +85,7 @@ def test_estimate_tokens_and_split_text():
     assert len(segments2) >= 2
 
 
-def test_generate_bilingual_transcript_keeps_chinese_first(monkeypatch):
-    tp = _build_tp_with_configs()
-
+def test_generate_bilingual_transcript_keeps_chinese_first(tp, monkeypatch):
     def fake_process(text, prompt):  # noqa: D401
         assert "中文在上" in prompt
         return "Hello world.\n你好，世界。\n\nHow are you?\n你好吗？\n"
@@ -33,12 +33,39 @@ def test_get_ffmpeg_path_uses_shutil_which(monkeypatch, tmp_path):
     def fake_which(_name):  # noqa: D401
         return "/usr/bin/ffmpeg"
 
+    monkeypatch.setattr(vd_mod, "_FFMPEG_PATH_CACHE", {})
     monkeypatch.setattr(vd_mod.shutil, "which", fake_which)
 
     path = vd._get_ffmpeg_path()
     assert path == "/usr/bin/ffmpeg"
 
 
+def test_get_ffmpeg_path_caches_hits_per_path_env(monkeypatch, tmp_path):
+    _patch_config_for_tmp(tmp_path, monkeypatch)
+
+    from app.services import video_downloader as vd_mod
+
+    vd = VideoDownloader()
+    calls = []
+
+    def fake_which(name):  # noqa: D401
+        calls.append(name)
+        return "/opt/ffmpeg/bin/ffmpeg"
+
+    monkeypatch.setattr(vd_mod, "_FFMPEG_PATH_CACHE", {})
+    monkeypatch.setattr(vd_mod.shutil, "which", fake_which)
+    monkeypatch.setenv("PATH", "/opt/ffmpeg/bin")
+
+    assert vd._get_ffmpeg_path() == "/opt/ffmpeg/bin/ffmpeg"
+    assert vd._get_ffmpeg_path() == "/opt/ffmpeg/bin/ffmpeg"
+    assert calls == ["ffmpeg"]
+
+    # a different PATH is probed again
+    monkeypatch.setenv("PATH", "/elsewhere")
+    vd._get_ffmpeg_path()
+    assert calls == ["ffmpeg", "ffmpeg"]
+
+
 def test_get_video_info_flattens_playlist_and_cleans_cookie(tmp_path, monkeypatch):
     _patch_config_for_tmp(tmp_path, monkeypatch)
 
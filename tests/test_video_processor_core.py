@@ -1,6 +1,8 @@
 import json
 import os
+import sys
 
+import app.services.video_processor as video_processor_module
 from app.models.data_models import VideoInfo
 from app.services.video_processor import VideoProcessor
 from app.config.settings import Config
@@ -37,6 +39,46 @@ def test_create_task_creates_distinct_ids_for_same_url(tmp_path, monkeypatch):
     assert task_id_1 != task_id_2
 
 
+def test_task_dir_matches_os_path_join(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    vp = VideoProcessor()
+    assert vp.task_dir("abc") == os.path.join(vp.output_dir, "abc")
+
+    # output_dir is read at call time, so later overrides are respected
+    vp.output_dir = str(tmp_path / "other")
+    assert vp.task_dir("abc") == os.path.join(str(tmp_path / "other"), "abc")
+
+
+def test_video_processor_parses_config_once_for_all_services(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    calls = []
+
+    def fake_load_config():
+        calls.append(1)
+        return cfg
+
+    monkeypatch.setattr(Config, "load_config", staticmethod(fake_load_config))
+
+    vp = VideoProcessor()
+
+    assert len(calls) == 1
+    assert vp.video_downloader.config is cfg
+    assert vp.audio_extractor.config is cfg
+    assert vp.file_uploader.config is cfg
+
+
 def test_cancel_flags_and_cancel_all_processing(tmp_path, monkeypatch):
     temp_dir = tmp_path / "temp"
     output_dir = tmp_path / "output"
@@ -64,6 +106,85 @@ def test_cancel_flags_and_cancel_all_processing(tmp_path, monkeypatch):
     assert vp._is_cancelled(t2) is False
 
 
+def test_tasks_are_capped_by_max_tasks_keeping_running_ones(tmp_path, monkeypatch, caplog):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    cfg["processing"] = {"max_tasks": 2}
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    vp = VideoProcessor()
+    t1 = vp.create_task("https://example.com/1")
+    vp.get_task(t1).status = "processing"
+    vp.request_cancel(t1)
+    t2 = vp.create_task("https://example.com/2")
+    vp.get_task(t2).status = "completed"
+    with caplog.at_level("INFO", logger="app.services.video_processor"):
+        t3 = vp.create_task("https://example.com/3")
+
+    # evictions are logged with the dropped ids
+    assert any(t2 in r.getMessage() for r in caplog.records)
+    # t1 is oldest but still running, so the oldest finished task goes instead
+    assert list(vp.tasks) == [t1, t3]
+    assert vp.get_task(t2) is None
+
+    vp.get_task(t1).status = "failed"
+    t4 = vp.create_task("https://example.com/4")
+    assert list(vp.tasks) == [t3, t4]
+    assert vp._is_cancelled(t1) is False
+
+    saved = json.loads((output_dir / "tasks.json").read_text(encoding="utf-8"))
+    assert [t["id"] for t in saved] == [t3, t4]
+
+
+def test_tasks_are_not_capped_by_default(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    vp = VideoProcessor()
+    assert vp.max_tasks == 0
+    ids = []
+    for i in range(3):
+        ids.append(vp.create_task(f"https://example.com/{i}"))
+        vp.get_task(ids[-1]).status = "completed"
+    assert list(vp.tasks) == ids
+
+
+def test_task_cap_never_evicts_new_or_live_tasks(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    cfg["processing"] = {"max_tasks": 2}
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    vp = VideoProcessor()
+    running = vp.create_task("https://example.com/1")
+    vp.get_task(running).status = "processing"
+    translating = vp.create_task("https://example.com/2")
+    vp.get_task(translating).status = "completed"
+    vp.get_task(translating).translation_status = "processing"
+    # 上传完成但尚未开始处理：status 仍为 pending
+    uploaded = vp.create_upload_task("a.mp3", 10, "audio", "audio/mpeg")
+    vp.complete_upload_task(uploaded, str(temp_dir / "a.mp3"))
+
+    new_id = vp.create_task("https://example.com/4")
+
+    # Every older task is still in use, so the cap is exceeded rather than dropping one
+    assert list(vp.tasks) == [running, translating, uploaded, new_id]
+    assert vp.get_task(new_id) is not None
+
+
 def test_save_and_load_tasks_round_trip(tmp_path, monkeypatch):
     temp_dir = tmp_path / "temp"
     output_dir = tmp_path / "output"
@@ -120,6 +241,9 @@ def test_save_and_load_tasks_round_trip(tmp_path, monkeypatch):
     assert loaded_task is not None
     assert loaded_task.video_url == url
     assert loaded_task.status == "completed"
+    # statuses read from JSON are interned, i.e. the same object as the literal
+    assert loaded_task.status is sys.intern("completed")
+    assert loaded_task.translation_status is sys.intern("completed")
     assert loaded_task.transcript == "hello"
     assert loaded_task.video_file_path == task.video_file_path
     assert loaded_task.progress == 88
@@ -136,6 +260,108 @@ def test_save_and_load_tasks_round_trip(tmp_path, monkeypatch):
     assert loaded_task.video_info.description == "desc"
 
 
+def test_load_tasks_marks_interrupted_tasks_failed_and_rewrites_file(
+    tmp_path, monkeypatch
+):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    records = [
+        {
+            "id": "t-run",
+            "video_url": "https://example.com/a",
+            "status": "processing",
+            "created_at": "2024-01-01T00:00:00",
+            "progress": 40,
+            "video_info": {"title": "Running", "duration": 3},
+        },
+        {
+            "id": "t-up",
+            "type": "upload",
+            "status": "completed",
+            "created_at": "2024-01-01T00:00:00",
+            "original_filename": "a.mp3",
+            "upload_time": "2024-01-01T00:00:01",
+            "upload_status": "completed",
+        },
+    ]
+    (output_dir / "tasks.json").write_text(json.dumps(records), encoding="utf-8")
+
+    vp = VideoProcessor()
+
+    running = vp.get_task("t-run")
+    assert running.status == "failed"
+    assert running.progress == 0
+    assert running.video_info.title == "Running"
+    assert running.video_info.url == "https://example.com/a"
+    upload = vp.get_task("t-up")
+    assert upload.original_filename == "a.mp3"
+    assert upload.upload_time is not None
+
+    # the cleaned-up state is written back so the next start sees it too
+    on_disk = json.loads((output_dir / "tasks.json").read_text(encoding="utf-8"))
+    assert {r["id"]: r["status"] for r in on_disk} == {
+        "t-run": "failed",
+        "t-up": "completed",
+    }
+
+
+def test_save_and_load_tasks_falls_back_to_stdlib_json(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+    monkeypatch.setattr(video_processor_module, "orjson", None)
+
+    vp1 = VideoProcessor()
+    task_id = vp1.create_task("https://example.com/video")
+    vp1.get_task(task_id).status = "completed"
+    vp1.get_task(task_id).transcript = "你好"
+    vp1.save_tasks_to_disk()
+
+    raw = (output_dir / "tasks.json").read_text(encoding="utf-8")
+    # 与 orjson 输出一致：中文不转义
+    assert "你好" in raw
+
+    loaded_task = VideoProcessor().get_task(task_id)
+    assert loaded_task is not None
+    assert loaded_task.transcript == "你好"
+
+
+def test_failed_tasks_write_keeps_previous_file_and_removes_tmp(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "temp"
+    output_dir = tmp_path / "output"
+    temp_dir.mkdir()
+    output_dir.mkdir()
+
+    cfg = _make_config(str(temp_dir), str(output_dir))
+    monkeypatch.setattr(Config, "load_config", staticmethod(lambda: cfg))
+
+    vp = VideoProcessor()
+    task_id = vp.create_task("https://example.com/video")
+    vp.save_tasks_to_disk()
+    tasks_file = output_dir / "tasks.json"
+    before = tasks_file.read_bytes()
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(video_processor_module.os, "replace", failing_replace)
+    vp.get_task(task_id).status = "completed"
+    vp.save_tasks_to_disk()  # 错误只记录日志，不向外抛出
+
+    assert tasks_file.read_bytes() == before
+    assert not (output_dir / "tasks.json.tmp").exists()
+
+
 def test_video_processor_init_cleans_stale_partial_download_dirs(tmp_path, monkeypatch):
     temp_dir = tmp_path / "temp"
     output_dir = tmp_path / "output"
@@ -132,8 +132,11 @@ def test_translate_transcript_success_and_failure(tmp_path, monkeypatch):
 
     # Bilingual file should be written under output_dir/task_id
     task_dir = os.path.join(vp.output_dir, tid)
-    files = [f for f in os.listdir(task_dir) if f.startswith("transcript_bilingual_")]
+    with os.scandir(task_dir) as it:
+        files = [e.path for e in it if e.name.startswith("transcript_bilingual_")]
     assert files, "expected bilingual transcript file to be created"
+    with open(files[0], "rb") as f:
+        assert f.read() == b"BILINGUAL CONTENT\n"
 
     # Failure branch: generation error should mark status failed and propagate
     tid2 = vp.create_task("https://example.com/vid2")
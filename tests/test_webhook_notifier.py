@@ -1,10 +1,20 @@
+import threading
 import types
 
 import pytest
 
+import app.utils.webhook_notifier as webhook_notifier
 from app.utils.webhook_notifier import send_task_completed_webhooks
 
 
+def _patch_http(monkeypatch, get, post):
+    """Swap the notifier's pooled session for a stub with the given get/post."""
+
+    monkeypatch.setattr(
+        webhook_notifier, "_SESSION", types.SimpleNamespace(get=get, post=post)
+    )
+
+
 class _DummyTask:
     def __init__(self, *, status="completed") -> None:
         self.id = "task-123"
@@ -33,8 +43,7 @@ def test_noop_when_not_completed(monkeypatch):
     def fake_post(*args, **kwargs):  # pragma: no cover - defensive
         called["post"] += 1
 
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.get", fake_get)
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.post", fake_post)
+    _patch_http(monkeypatch, fake_get, fake_post)
 
     task = _DummyTask(status="processing")
     cfg = {
@@ -50,6 +59,25 @@ def test_noop_when_not_completed(monkeypatch):
     assert called["post"] == 0
 
 
+def test_noop_before_building_brief_when_no_provider_enabled(monkeypatch):
+    """Completed task with every provider disabled returns before any formatting."""
+
+    def boom(*args, **kwargs):  # pragma: no cover - must not be reached
+        raise AssertionError("webhook work must be skipped")
+
+    monkeypatch.setattr(webhook_notifier, "_build_task_brief", boom)
+    monkeypatch.setattr(webhook_notifier, "_should_enforce_webhook_url_safety", boom)
+    _patch_http(monkeypatch, boom, boom)
+
+    cfg = {
+        "enabled": True,
+        "base_url": "https://host.example",
+        "bark": {"enabled": False, "key": "k"},
+        "wecom": {"enabled": False, "webhook_url": "https://wx.example"},
+    }
+    send_task_completed_webhooks(_DummyTask(), base_config=cfg, runtime_config=None)
+
+
 def test_bark_and_wecom_called_when_enabled(monkeypatch):
     """When enabled and properly configured, both providers are invoked."""
 
@@ -68,8 +96,7 @@ def test_bark_and_wecom_called_when_enabled(monkeypatch):
         calls["post"].append({"url": url, "json": json, "timeout": timeout})
         return DummyResp(200, "wecom-ok")
 
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.get", fake_get)
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.post", fake_post)
+    _patch_http(monkeypatch, fake_get, fake_post)
 
     task = _DummyTask(status="completed")
     base_cfg = {
@@ -109,6 +136,7 @@ def test_bark_and_wecom_called_when_enabled(monkeypatch):
     assert "任务完成" in text
     assert "Example Title" in text
     assert "任务ID: task-123" in text
+    assert text.endswith("结果链接: https://host.example/?task_id=task-123")
     assert payload["text"].get("mentioned_mobile_list") == ["13800000000"]
     assert payload["text"].get("mentioned_userid_list") == ["user1"]
 
@@ -127,10 +155,7 @@ def test_runtime_config_overrides_base(monkeypatch):
         calls["get"].append({"url": url, "params": params, "timeout": timeout})
         return DummyResp()
 
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.get", fake_get)
-    monkeypatch.setattr(
-        "app.utils.webhook_notifier.requests.post", lambda *args, **kwargs: DummyResp()
-    )
+    _patch_http(monkeypatch, fake_get, lambda *args, **kwargs: DummyResp())
 
     task = _DummyTask(status="completed")
 
@@ -151,6 +176,26 @@ def test_runtime_config_overrides_base(monkeypatch):
     assert "base-key" not in url
 
 
+def test_merge_dict_is_deep_and_ignores_none_at_any_depth():
+    base = {
+        "enabled": True,
+        "bark": {"enabled": False, "key": "base-key", "extra": {"a": 1, "b": 2}},
+        "wecom": {"enabled": True, "webhook_url": "https://wx.example"},
+    }
+    override = {
+        "enabled": None,
+        "bark": {"enabled": True, "key": None, "extra": {"b": 3}},
+    }
+
+    merged = webhook_notifier._merge_dict(base, override)
+
+    assert merged["enabled"] is True
+    assert merged["bark"] == {"enabled": True, "key": "base-key", "extra": {"a": 1, "b": 3}}
+    # untouched sections are shared, and base itself is not mutated
+    assert merged["wecom"] is base["wecom"]
+    assert base["bark"] == {"enabled": False, "key": "base-key", "extra": {"a": 1, "b": 2}}
+
+
 def test_strict_mode_skips_unsafe_targets_without_http(monkeypatch):
     """When strict mode is enabled, unsafe webhook targets should be skipped.
 
@@ -169,14 +214,13 @@ def test_strict_mode_skips_unsafe_targets_without_http(monkeypatch):
 
     def fake_get(*args, **kwargs):
         called["get"] += 1
-        raise AssertionError("requests.get must not be called in strict skip case")
+        raise AssertionError("session.get must not be called in strict skip case")
 
     def fake_post(*args, **kwargs):
         called["post"] += 1
-        raise AssertionError("requests.post must not be called in strict skip case")
+        raise AssertionError("session.post must not be called in strict skip case")
 
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.get", fake_get)
-    monkeypatch.setattr("app.utils.webhook_notifier.requests.post", fake_post)
+    _patch_http(monkeypatch, fake_get, fake_post)
 
     task = _DummyTask(status="completed")
     cfg = {
@@ -188,3 +232,61 @@ def test_strict_mode_skips_unsafe_targets_without_http(monkeypatch):
     send_task_completed_webhooks(task, base_config=cfg, runtime_config=None)
     assert called["get"] == 0
     assert called["post"] == 0
+
+
+def test_session_is_shared_and_pooled(monkeypatch):
+    monkeypatch.setattr(webhook_notifier, "_SESSION", None)
+
+    session = webhook_notifier._get_session()
+    assert webhook_notifier._get_session() is session
+
+    adapter = session.get_adapter("https://api.day.app")
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 1
+    assert adapter.max_retries.raise_on_status is False
+
+
+def test_bark_and_wecom_are_sent_concurrently(monkeypatch):
+    # Each fake call waits for the other; this only completes if both run at once.
+    barrier = threading.Barrier(2, timeout=5)
+
+    class DummyResp:
+        status_code = 200
+        text = "ok"
+
+    def fake_get(url, params=None, timeout=None):
+        barrier.wait()
+        return DummyResp()
+
+    def fake_post(url, json=None, timeout=None):
+        barrier.wait()
+        return DummyResp()
+
+    _patch_http(monkeypatch, fake_get, fake_post)
+
+    cfg = {
+        "enabled": True,
+        "bark": {"enabled": True, "key": "k"},
+        "wecom": {"enabled": True, "webhook_url": "https://wx.example"},
+    }
+    send_task_completed_webhooks(_DummyTask(), base_config=cfg, runtime_config=None)
+
+    assert not barrier.broken
+
+
+def test_providers_are_dispatched_through_registry(monkeypatch):
+    sent = []
+
+    def fake_sender(self, cfg, *, title, body, task_url, task_id):  # noqa: D401
+        sent.append((cfg["channel"], task_id, "Example Title" in body))
+
+    monkeypatch.setattr(
+        webhook_notifier.WebhookNotifier, "_send_fake", fake_sender, raising=False
+    )
+    monkeypatch.setitem(webhook_notifier._PROVIDERS, "fake", ("_send_fake", "url"))
+    _patch_http(monkeypatch, None, None)
+
+    cfg = {"enabled": True, "fake": {"enabled": True, "channel": "c1"}}
+    send_task_completed_webhooks(_DummyTask(), base_config=cfg, runtime_config=None)
+
+    assert sent == [("c1", "task-123", True)]